@@ -0,0 +1,7 @@
+"""Create the indexes and tables the MCP server relies on. Run once per deploy: python migrate.py"""
+from server import _engine, migrate
+
+if __name__ == "__main__":
+    if not _engine:
+        raise SystemExit("DATABASE_URL environment variable is not set.")
+    migrate()
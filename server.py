@@ -1,61 +1,218 @@
+import asyncio
 import logging
 import os
+import random
 import base64
-import json
-import time
+import binascii
+import collections
+import functools
+import hashlib
+import heapq
+import io
+import re
 import secrets
-import requests
+import threading
+import httpx
+import orjson
+from cachetools import LRUCache, TTLCache
+from contextlib import asynccontextmanager
+from types import MappingProxyType
 from typing import Optional
-from urllib.parse import urlparse
+from urllib.parse import quote, urlparse
 from fastmcp import FastMCP
+from pydantic import BaseModel, ConfigDict, Field
 
 logger = logging.getLogger(__name__)
-from sqlalchemy import create_engine, text
-from sqlalchemy.orm import sessionmaker, Session
+from psycopg.types.json import set_json_loads
+from sqlalchemy import column, create_engine, make_url, table, text
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import QueuePool
 from dotenv import load_dotenv
 
 # Load environment variables from .env file
 load_dotenv()
 
-mcp = FastMCP("Keyword MCP Server")
+# Shared async HTTP client for outbound API calls (keep-alive pool reused across tool calls);
+# HTTP/2 multiplexes concurrent DataForSEO requests over one TLS connection where the server allows
+_http_client = httpx.AsyncClient(
+    http2=True,
+    timeout=30.0,
+    limits=httpx.Limits(max_connections=100, max_keepalive_connections=20),
+    headers={"Content-Type": "application/json"},
+)
+
+
+DATAFORSEO_WARMUP_URL = "https://api.dataforseo.com/v3/"
+
+
+async def _warm_dataforseo_connections() -> None:
+    """Open a keep-alive connection to DataForSEO so the first tool call skips the TLS handshake."""
+    try:
+        await _http_client.head(DATAFORSEO_WARMUP_URL, timeout=5)
+    except httpx.HTTPError as e:
+        logger.info("DataForSEO connection warmup failed: %s", e)
+
+
+# Pooled DB connections opened at startup (the pool otherwise connects lazily, on first use)
+DB_WARM_CONNECTIONS = 5
+
+
+def _warm_db_pool() -> None:
+    """Open DB_WARM_CONNECTIONS pooled connections so the first DB tool calls skip connect, TLS and auth."""
+    if not _engine:
+        return
+    # Hold them all at once: connect/close in turn would reuse a single pooled connection
+    conns = []
+    try:
+        for _ in range(DB_WARM_CONNECTIONS):
+            conns.append(_engine.connect())
+    except Exception as e:
+        logger.info("Database pool warmup failed: %s", e)
+    finally:
+        for conn in conns:
+            conn.close()
+
+
+async def _warm_connections() -> None:
+    await asyncio.gather(_warm_dataforseo_connections(), asyncio.to_thread(_warm_db_pool))
+
+
+@asynccontextmanager
+async def _lifespan(server):
+    """Warm outbound connections on startup; close the shared HTTP client when the server shuts down."""
+    warmup = asyncio.create_task(_warm_connections())
+    try:
+        yield {}
+    finally:
+        warmup.cancel()
+        await _http_client.aclose()
+        await _gemini_http.aclose()
+        await _backend_http.aclose()
+
+
+def _serialize_tool_result(data) -> str:
+    """Serialize tool results with orjson; FastMCP falls back to its default encoder if this raises."""
+    return orjson.dumps(data, default=str, option=orjson.OPT_NON_STR_KEYS).decode()
+
+
+mcp = FastMCP("Keyword MCP Server", lifespan=_lifespan, tool_serializer=_serialize_tool_result)
 
 # Database setup - create engine once
+# Pool is sized for concurrent MCP tool calls; pool_size + max_overflow must stay
+# within Postgres max_connections (shared with the arb backend).
 _database_url = os.getenv("DATABASE_URL")
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "20"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "40"))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+DB_POOL_TIMEOUT = int(os.getenv("DB_POOL_TIMEOUT", "10"))
 _engine = None
 _SessionLocal = None
 
+
+def _psycopg_url(url: str):
+    """DATABASE_URL with the driver pinned to psycopg (v3); plain postgresql:// would pick psycopg2."""
+    parsed = make_url(url)
+    if parsed.drivername in ("postgres", "postgresql", "postgresql+psycopg2"):
+        parsed = parsed.set(drivername="postgresql+psycopg")
+    return parsed
+
+
 if _database_url:
-    _engine = create_engine(_database_url)
+    # Decode json/jsonb columns with orjson instead of stdlib json
+    set_json_loads(orjson.loads)
+    _engine = create_engine(
+        _psycopg_url(_database_url),
+        poolclass=QueuePool,
+        pool_size=DB_POOL_SIZE,
+        max_overflow=DB_MAX_OVERFLOW,
+        pool_pre_ping=True,  # drop connections killed by idle timeouts
+        pool_recycle=DB_POOL_RECYCLE,  # reconnect before the DB side reaps them
+        pool_timeout=DB_POOL_TIMEOUT,
+        # Reuse the most recently returned connection: a small hot set stays warm and
+        # surplus connections sit idle long enough to be recycled
+        pool_use_lifo=True,
+        future=True,
+        # Server-side prepare statements a connection has run 5 times
+        connect_args={"prepare_threshold": 5},
+        insertmanyvalues_page_size=1000,
+    )
     _SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=_engine)
+    # A forked worker must not reuse the parent's pooled sockets; close=False leaves the
+    # parent's connections open and just gives the child a fresh pool
+    os.register_at_fork(after_in_child=lambda: _engine.dispose(close=False))
 
 # Google Gemini API setup
 _google_api_key = os.getenv("GOOGLE_API_KEY")
 _google_api_url = "https://generativelanguage.googleapis.com/v1beta/models/gemini-2.5-flash-image:generateContent"
 
+# Persistent HTTP/2 client for Gemini so generate_image reuses one TLS connection; the API key
+# is resolved once here and sent as a default header
+_gemini_http = httpx.AsyncClient(
+    http2=True,
+    timeout=60,
+    limits=httpx.Limits(max_keepalive_connections=10),
+    headers={"Content-Type": "application/json", "x-goog-api-key": _google_api_key or ""},
+)
+
 # AWS S3 setup
 _aws_access_key_id = os.getenv("AWS_ACCESS_KEY_ID")
 _aws_secret_access_key = os.getenv("AWS_SECRET_ACCESS_KEY")
 _aws_region = os.getenv("AWS_REGION", "us-east-2")
 _aws_s3_bucket = os.getenv("AWS_S3_BUCKET", "arb-imgs")
+# Public object URL prefix: https://bucket-name.s3.region.amazonaws.com/
+_S3_URL_PREFIX = f"https://{_aws_s3_bucket}.s3.{_aws_region}.amazonaws.com/"
 _s3_client = None
+_s3_client_lock = threading.Lock()
+S3_MULTIPART_THRESHOLD = 5 * 1024 * 1024
+
+
+def _get_s3_client():
+    """S3 client, created on first use so boto3 isn't imported unless generate_image runs. None without credentials."""
+    global _s3_client
+    if _s3_client is None and _aws_access_key_id and _aws_secret_access_key:
+        with _s3_client_lock:
+            if _s3_client is None:
+                import boto3
+                from botocore.config import Config
+                _s3_client = boto3.client(
+                    's3',
+                    aws_access_key_id=_aws_access_key_id,
+                    aws_secret_access_key=_aws_secret_access_key,
+                    region_name=_aws_region,
+                    # Keep-alive and a larger pool for bursts of generate_image uploads;
+                    # adaptive retries back off on S3 503 SlowDown
+                    config=Config(
+                        tcp_keepalive=True,
+                        max_pool_connections=50,
+                        retries={"max_attempts": 5, "mode": "adaptive"},
+                    ),
+                )
+    return _s3_client
 
-if _aws_access_key_id and _aws_secret_access_key:
-    import boto3
-    _s3_client = boto3.client(
-        's3',
-        aws_access_key_id=_aws_access_key_id,
-        aws_secret_access_key=_aws_secret_access_key,
-        region_name=_aws_region
-    )
-
-def get_db_session() -> Session:
-    """Get a database session."""
+def _session_scope():
+    """Session in a transaction: commits on exit, rolls back on error, and always closes (returning its pooled connection)."""
     if not _SessionLocal:
         raise ValueError("DATABASE_URL environment variable is not set.")
-    return _SessionLocal()
+    return _SessionLocal.begin()
+
+
+def _db_reader():
+    """Pooled connection for single reads: autocommit, so no transaction is opened or committed."""
+    if not _engine:
+        raise ValueError("DATABASE_URL environment variable is not set.")
+    return _engine.connect().execution_options(isolation_level="AUTOCOMMIT")
+
+
+def _db_writer():
+    """Pooled connection inside a transaction that commits on exit and rolls back on error."""
+    if not _engine:
+        raise ValueError("DATABASE_URL environment variable is not set.")
+    return _engine.begin()
 
 
 # --- DataForSEO shared auth and helpers (Labs + Keywords Data; sitemap/on-page moved to arb-v1) ---
+@functools.lru_cache(maxsize=None)
 def _dataforseo_basic_auth() -> str:
     """DataForSEO Basic auth: USERNAME + API_SECRET, or API_KEY + API_SECRET, or API_KEY as raw Base64."""
     username = os.getenv("DATAFORSEO_USERNAME") or os.getenv("DATAFORSEO_API_KEY")
@@ -67,6 +224,142 @@ def _dataforseo_basic_auth() -> str:
     return ""
 
 
+# Resolved once at startup; every DataForSEO call reuses the same read-only headers
+_DFS_AUTH = _dataforseo_basic_auth()
+_DFS_HEADERS = MappingProxyType({"Content-Type": "application/json", "Authorization": f"Basic {_DFS_AUTH}"})
+if not _DFS_AUTH:
+    logger.warning("DataForSEO credentials not set; DataForSEO tools will fail until they are configured.")
+
+
+def _require_dfs_auth() -> None:
+    if not _DFS_AUTH:
+        raise ValueError("DATAFORSEO_USERNAME + DATAFORSEO_API_SECRET (or API_KEY) not set.")
+
+
+# DataForSEO responses change slowly; cache successful ones per request payload for a day.
+# Entries are the raw response bytes and the cache is bounded by their total size, since a
+# single keywords_data or labs response can run to several MB.
+DFS_CACHE_MAX_BYTES = int(os.getenv("DATAFORSEO_CACHE_MB", "128")) * 1024 * 1024
+_dfs_cache = TTLCache(maxsize=DFS_CACHE_MAX_BYTES, ttl=24 * 3600, getsizeof=len)
+
+
+@functools.lru_cache(maxsize=8192)
+def _normalize_keyword(keyword: str) -> str:
+    """Canonical form used for cache keys: casefolded, whitespace collapsed. DataForSEO itself ignores both."""
+    return " ".join(keyword.casefold().split())
+
+
+# Cap on in-flight DataForSEO requests, plus retry policy for throttling and transient failures
+_DFS_MAX_CONCURRENCY = int(os.getenv("DATAFORSEO_CONCURRENCY", "16"))
+_DFS_MAX_ATTEMPTS = 5
+_DFS_RETRY_STATUSES = frozenset({429, 502, 503, 504})
+_dfs_sem = asyncio.Semaphore(_DFS_MAX_CONCURRENCY)
+
+
+def _dfs_retry_delay(attempt: int, response: Optional[httpx.Response] = None) -> float:
+    """Seconds to wait before the next attempt: Retry-After when the API sends one, else jittered exponential backoff."""
+    if response is not None:
+        retry_after = response.headers.get("Retry-After")
+        if retry_after:
+            try:
+                return min(float(retry_after), 60.0)
+            except ValueError:
+                pass  # HTTP-date form; fall back to backoff
+    return min(0.5 * (2 ** attempt), 8.0) + random.uniform(0, 0.5)
+
+
+async def _dfs_post(url: str, body: bytes, timeout: float) -> httpx.Response:
+    """POST with bounded concurrency, retrying transport errors and 429/5xx responses."""
+    for attempt in range(_DFS_MAX_ATTEMPTS):
+        try:
+            async with _dfs_sem:
+                response = await _http_client.post(url, headers=_DFS_HEADERS, content=body, timeout=timeout)
+        except httpx.TransportError:
+            if attempt == _DFS_MAX_ATTEMPTS - 1:
+                raise
+            delay = _dfs_retry_delay(attempt)
+        else:
+            if response.status_code not in _DFS_RETRY_STATUSES or attempt == _DFS_MAX_ATTEMPTS - 1:
+                return response
+            delay = _dfs_retry_delay(attempt, response)
+        await asyncio.sleep(delay)
+
+
+# DataForSEO language codes: ISO 639 with an optional region/script suffix (en, pt, zh-TW)
+_LANGUAGE_CODE_RE = re.compile(r"[a-z]{2,3}(?:-[A-Za-z]{2,4})?")
+
+
+def _validate_dfs_locale(location_code: int, language_code: str) -> None:
+    """Reject malformed location/language codes before spending a DataForSEO request on them."""
+    if type(location_code) is not int or location_code <= 0:
+        raise ValueError(f"Invalid location_code: {location_code!r}")
+    if not isinstance(language_code, str) or not _LANGUAGE_CODE_RE.fullmatch(language_code):
+        raise ValueError(f"Invalid language_code: {language_code!r}")
+
+
+def _clean_keywords(keywords: Optional[list[str]]) -> list[str]:
+    """Strip keywords and drop blank ones."""
+    return [k for k in map(str.strip, keywords or ()) if k]
+
+
+def _dfs_cache_key(url: str, payload) -> str:
+    return hashlib.blake2b(orjson.dumps([url, payload], option=orjson.OPT_SORT_KEYS), digest_size=16).hexdigest()
+
+
+async def _dfs_post_cached(
+    url: str,
+    payload: list,
+    no_cache: bool = False,
+    cache_payload: Optional[list] = None,
+    timeout: float = 30.0,
+) -> dict:
+    """
+    POST to a DataForSEO endpoint through the shared client and return the parsed JSON.
+    Successful responses are cached by (url, payload); pass cache_payload to key on a
+    normalized form of the payload. no_cache=True skips the lookup but still refreshes the entry.
+    """
+    _require_dfs_auth()
+    key = _dfs_cache_key(url, payload if cache_payload is None else cache_payload)
+    if not no_cache:
+        cached = _dfs_cache.get(key)
+        if cached is not None:
+            return orjson.loads(cached)
+    response = await _dfs_post(url, orjson.dumps(payload), timeout)
+    if response.status_code != 200:
+        raise Exception(f"DataForSEO API request failed with status code {response.status_code}: {response.text}")
+    data = orjson.loads(response.content)
+    tasks = data.get("tasks") or []
+    if tasks and all(t.get("status_code") == 20000 for t in tasks) and len(response.content) <= DFS_CACHE_MAX_BYTES:
+        _dfs_cache[key] = response.content
+    return data
+
+
+class DataForSEOTaskError(ValueError):
+    """A DataForSEO request went through but its task failed or came back missing."""
+
+
+async def _dfs_call(
+    url: str,
+    payload: list,
+    no_cache: bool = False,
+    cache_payload: Optional[list] = None,
+    timeout: float = 30.0,
+) -> list:
+    """
+    POST a single-task DataForSEO request and return that task's result list (empty when
+    the task succeeded without results). Raises DataForSEOTaskError when the task itself failed.
+    """
+    data = await _dfs_post_cached(url, payload, no_cache=no_cache, cache_payload=cache_payload, timeout=timeout)
+    tasks = data.get("tasks") or []
+    if not tasks:
+        raise DataForSEOTaskError("No tasks in DataForSEO API response")
+    task = tasks[0]
+    if task.get("status_code") != 20000:
+        raise DataForSEOTaskError(f"DataForSEO API error: {task.get('status_code')} - {task.get('status_message', 'Unknown error')}")
+    return task.get("result") or []
+
+
+@functools.lru_cache(maxsize=2048)
 def _normalize_target_domain(site_url: str) -> str:
     """Extract target domain for DataForSEO (no scheme, no www). E.g. setsail.ca."""
     p = urlparse(site_url)
@@ -78,105 +371,252 @@ def _normalize_target_domain(site_url: str) -> str:
     return netloc
 
 
+@functools.lru_cache(maxsize=4096)
+def _opportunities_target(domain: str) -> str:
+    """Target domain for keyword opportunities; also accepts a bare domain with no scheme."""
+    return _normalize_target_domain(domain) or domain.replace("https://", "").replace("http://", "").strip().lower()
+
+
+# keyword_overview/live accepts up to 700 keywords in a single task
+MAX_SEARCH_VOLUME_KEYWORDS = 700
+# get_search_volumes splits larger lists into concurrent 700-keyword requests, up to this many keywords
+MAX_SEARCH_VOLUMES_TOTAL = 10 * MAX_SEARCH_VOLUME_KEYWORDS
+# Window during which concurrent get_search_volume calls are merged into one request
+SEARCH_VOLUME_BATCH_WINDOW = 0.05
+
+_search_volume_pending: dict[tuple[int, str], dict[str, list[asyncio.Future]]] = {}
+_search_volume_flushes: set[asyncio.Task] = set()
+# Per-keyword results keyed by (normalized keyword, location_code, language_code). _dfs_cache is
+# keyed on whole batches, so a keyword seen in an earlier batch would otherwise be fetched again.
+_search_volume_cache = TTLCache(maxsize=10_000, ttl=24 * 3600)
+
+
+# Shared stand-in for a missing or null nested object in DataForSEO items (read-only, never allocated per item)
+_EMPTY = MappingProxyType({})
+
+# Static parts of the keyword_overview/live task; copied and filled in per call
+_KEYWORD_OVERVIEW_PROTO = MappingProxyType({
+    "include_clickstream_data": True,
+    "include_serp_info": True,
+})
+
+
+async def _fetch_keyword_overview(
+    keywords: list[str],
+    location_code: int,
+    language_code: str,
+    no_cache: bool = False,
+) -> dict[str, dict]:
+    """
+    Fetches keyword overview data for all keywords in one DataForSEO task.
+    Returns {normalized keyword: {keyword, search_volume, keyword_difficulty, main_intent}}
+    for the keywords DataForSEO has data for.
+    """
+    # DataForSEO API endpoint
+    url = "https://api.dataforseo.com/v3/dataforseo_labs/google/keyword_overview/live"
+
+    # Prepare the payload
+    payload_item = _KEYWORD_OVERVIEW_PROTO.copy()
+    payload_item.update(language_code=language_code, location_code=location_code, keywords=keywords)
+    payload = [payload_item]
+
+    cache_payload = [{**payload_item, "keywords": sorted({_normalize_keyword(k) for k in keywords})}]
+    result_list = await _dfs_call(url, payload, no_cache=no_cache, cache_payload=cache_payload)
+    if not result_list:
+        raise Exception("DataForSEO API returned no result")
+
+    # Extract relevant data from tasks[0].result[0].items
+    try:
+        result = result_list[0]
+        found = {}
+        for item in result.get('items') or []:
+            get = item.get
+            keyword = get('keyword')
+            # search_volume from keyword_info, keyword_difficulty from keyword_properties,
+            # main_intent from search_intent_info (any of which may be missing or null)
+            found[_normalize_keyword(keyword or "")] = {
+                "keyword": keyword,
+                "search_volume": (get('keyword_info') or _EMPTY).get('search_volume'),
+                "keyword_difficulty": (get('keyword_properties') or _EMPTY).get('keyword_difficulty'),
+                "main_intent": (get('search_intent_info') or _EMPTY).get('main_intent'),
+            }
+        for kw, item in found.items():
+            _search_volume_cache[(kw, location_code, language_code)] = item
+        return found
+    except (KeyError, IndexError, TypeError, AttributeError) as e:
+        raise Exception(f"Unexpected response structure from DataForSEO API: {e}. Result: {result_list}")
+
+
+def _no_search_volume_data(keyword: str) -> dict:
+    """Graceful response when DataForSEO has no data for a keyword."""
+    return {
+        "keyword": keyword,
+        "search_volume": None,
+        "keyword_difficulty": None,
+        "main_intent": None,
+        "error": "No data available for this keyword"
+    }
+
+
+def _settle_waiters(waiters: list[asyncio.Future], result=None, error: Optional[BaseException] = None) -> None:
+    for fut in waiters:
+        if not fut.done():
+            if error is not None:
+                fut.set_exception(error)
+            else:
+                fut.set_result(result)
+
+
+async def _flush_search_volume_batch(group: tuple[int, str], pending: dict[str, list[asyncio.Future]]) -> None:
+    """
+    After the batch window, send every queued keyword for this location/language in one request.
+    If the batched task fails, each keyword is retried on its own so one bad keyword only fails
+    its own callers.
+    """
+    await asyncio.sleep(SEARCH_VOLUME_BATCH_WINDOW)
+    # A full batch has already been replaced by a new one; only remove our own
+    if _search_volume_pending.get(group) is pending:
+        del _search_volume_pending[group]
+    location_code, language_code = group
+    try:
+        found = await _fetch_keyword_overview(list(pending), location_code, language_code)
+    except Exception as e:
+        if len(pending) == 1:
+            for waiters in pending.values():
+                _settle_waiters(waiters, error=e)
+            return
+        keywords = list(pending)
+        results = await asyncio.gather(
+            *(_fetch_keyword_overview([kw], location_code, language_code) for kw in keywords),
+            return_exceptions=True,
+        )
+        for kw, result in zip(keywords, results):
+            if isinstance(result, Exception):
+                _settle_waiters(pending[kw], error=result)
+            else:
+                _settle_waiters(pending[kw], result.get(kw))
+        return
+    for kw, waiters in pending.items():
+        _settle_waiters(waiters, found.get(kw))
+
+
+async def _coalesced_keyword_overview(keyword: str, location_code: int, language_code: str) -> Optional[dict]:
+    """Queue a keyword for the next batched keyword_overview request and wait for its result."""
+    group = (location_code, language_code)
+    pending = _search_volume_pending.get(group)
+    if pending is None or len(pending) >= MAX_SEARCH_VOLUME_KEYWORDS:
+        if pending is not None:
+            # Batch is full: let its flush task own it and start a new one
+            _search_volume_pending.pop(group)
+        pending = _search_volume_pending[group] = {}
+        task = asyncio.create_task(_flush_search_volume_batch(group, pending))
+        _search_volume_flushes.add(task)
+        task.add_done_callback(_search_volume_flushes.discard)
+    fut = asyncio.get_running_loop().create_future()
+    pending.setdefault(_normalize_keyword(keyword), []).append(fut)
+    return await fut
+
+
 @mcp.tool
-def get_search_volume(keyword: str, location_code: int = 2840, language_code: str = "en") -> dict:
+async def get_search_volume(
+    keyword: str,
+    location_code: int = 2840,
+    language_code: str = "en",
+    no_cache: bool = False,
+) -> dict:
     """
     Fetches keyword overview data for a given keyword using DataForSEO API.
+    Concurrent calls are merged into a single DataForSEO request; use get_search_volumes
+    to look up many keywords at once.
 
     Args:
         keyword (str): The keyword to fetch data for.
         location_code (int): The location code (default is 2840 for the United States).
         language_code (str): The language code (default is "en" for English).
+        no_cache (bool): Bypass the cached response and fetch fresh data (default False).
 
     Returns:
         dict: A dictionary containing keyword data, including search volume, keyword difficulty, and main intent.
     """
-    # DataForSEO API endpoint
-    url = "https://api.dataforseo.com/v3/dataforseo_labs/google/keyword_overview/live"
+    _validate_dfs_locale(location_code, language_code)
+    keyword = keyword.strip()
+    if not keyword:
+        # Rejected here rather than queued, where it would fail the whole batch
+        raise ValueError("A non-blank keyword is required.")
+    if no_cache:
+        found = await _fetch_keyword_overview([keyword], location_code, language_code, no_cache=True)
+        item = found.get(_normalize_keyword(keyword))
+    else:
+        item = _search_volume_cache.get((_normalize_keyword(keyword), location_code, language_code))
+        if item is None:
+            item = await _coalesced_keyword_overview(keyword, location_code, language_code)
+    return item or _no_search_volume_data(keyword)
 
-    # Retrieve DataForSEO Base64 authorization key from environment variable
-    api_key_base64 = os.getenv("DATAFORSEO_API_KEY")  # Base64 encoded "username:password"
 
-    if not api_key_base64:
-        raise ValueError("DATAFORSEO_API_KEY environment variable is not set.")
+@mcp.tool
+async def get_search_volumes(
+    keywords: list[str],
+    location_code: int = 2840,
+    language_code: str = "en",
+    no_cache: bool = False,
+) -> dict:
+    """
+    Fetches keyword overview data for many keywords in a single DataForSEO request
+    (or several concurrent requests of 700 keywords each for longer lists).
 
-    # Prepare the payload
-    payload = [
-        {
-            "language_code": language_code,
-            "location_code": location_code,
-            "include_clickstream_data": True,
-            "include_serp_info": True,
-            "keywords": [keyword]
-        }
-    ]
+    Args:
+        keywords (list[str]): Keywords to fetch data for (max 7000 distinct). Duplicates are looked
+            up once and blank entries are skipped; every input position still gets an item.
+        location_code (int): The location code (default is 2840 for the United States).
+        language_code (str): The language code (default is "en" for English).
+        no_cache (bool): Bypass the cached response and fetch fresh data (default False).
 
-    # Make the POST request with Base64 Authorization header
-    headers = {
-        "Content-Type": "application/json",
-        "Authorization": f"Basic {api_key_base64}"
+    Returns:
+        dict: 'items' aligned with the input keywords; each item has keyword, search_volume,
+              keyword_difficulty and main_intent (plus 'error' when no data is available).
+    """
+    # Look up each distinct non-blank keyword once; results are mapped back to every input position
+    unique: dict[str, str] = {}
+    for k in _clean_keywords(keywords):
+        unique.setdefault(_normalize_keyword(k), k)
+    lookup = list(unique.values())
+    if not lookup:
+        raise ValueError("At least one non-blank keyword is required.")
+    _validate_dfs_locale(location_code, language_code)
+    if len(lookup) > MAX_SEARCH_VOLUMES_TOTAL:
+        raise ValueError(f"Maximum {MAX_SEARCH_VOLUMES_TOTAL} distinct keywords allowed per request.")
+    if len(lookup) <= MAX_SEARCH_VOLUME_KEYWORDS:
+        found = await _fetch_keyword_overview(lookup, location_code, language_code, no_cache=no_cache)
+    else:
+        # Chunks run concurrently, bounded by _dfs_sem
+        chunks = await asyncio.gather(*(
+            _fetch_keyword_overview(lookup[i:i + MAX_SEARCH_VOLUME_KEYWORDS], location_code, language_code, no_cache=no_cache)
+            for i in range(0, len(lookup), MAX_SEARCH_VOLUME_KEYWORDS)
+        ))
+        found = {}
+        for chunk in chunks:
+            found.update(chunk)
+    items = [found.get(_normalize_keyword(k)) or _no_search_volume_data(k) for k in keywords]
+    return {
+        "items": items,
+        "location_code": location_code,
+        "language_code": language_code,
     }
-    response = requests.post(url, headers=headers, json=payload)
-
-    # Check for successful response
-    if response.status_code != 200:
-        raise Exception(f"DataForSEO API request failed with status code {response.status_code}: {response.text}")
 
-    # Parse the response
-    data = response.json()
 
-    # Extract relevant data from tasks[0].result[0].items[0]
-    try:
-        if 'tasks' not in data or not data['tasks']:
-            raise Exception("No tasks in DataForSEO API response")
-        
-        task = data['tasks'][0]
-        if 'result' not in task or not task['result']:
-            status_code = task.get('status_code')
-            status_message = task.get('status_message', 'Unknown error')
-            raise Exception(f"DataForSEO API returned no result. Status: {status_code} - {status_message}")
-        
-        if not isinstance(task['result'], list) or not task['result']:
-            raise Exception("DataForSEO API result is not a list or is empty")
-        
-        result = task['result'][0]
-        if 'items' not in result or not result['items']:
-            # Return a graceful response when no data is available
-            return {
-                "keyword": keyword,
-                "search_volume": None,
-                "keyword_difficulty": None,
-                "main_intent": None,
-                "error": "No data available for this keyword"
-            }
-        
-        item = result['items'][0]
-        
-        # Extract search_volume from keyword_info
-        keyword_info = item.get('keyword_info', {})
-        search_volume = keyword_info.get('search_volume')
-        
-        # Extract keyword_difficulty from keyword_properties
-        keyword_properties = item.get('keyword_properties', {})
-        keyword_difficulty = keyword_properties.get('keyword_difficulty')
-        
-        # Extract main_intent from search_intent_info
-        search_intent_info = item.get('search_intent_info', {})
-        main_intent = search_intent_info.get('main_intent')
-        
-        keyword_data = {
-            "keyword": item.get('keyword'),
-            "search_volume": search_volume,
-            "keyword_difficulty": keyword_difficulty,
-            "main_intent": main_intent
-        }
-        return keyword_data
-    except (KeyError, IndexError, TypeError) as e:
-        raise Exception(f"Unexpected response structure from DataForSEO API: {e}. Response: {data}")
+# keyword_info fields copied straight through by getKeywordIdeas
+_KEYWORD_IDEA_INFO_FIELDS = (
+    "search_volume",
+    "competition",
+    "competition_level",
+    "cpc",
+    "low_top_of_page_bid",
+    "high_top_of_page_bid",
+)
 
 
 @mcp.tool
-def getKeywordIdeas(
+async def getKeywordIdeas(
     keywords: list[str],
     location_code: int = 2840,
     language_code: str = "en",
@@ -184,7 +624,9 @@ def getKeywordIdeas(
     include_serp_info: bool = True,
     include_clickstream_data: bool = False,
     filters: Optional[list] = None,
-    order_by: Optional[list] = None
+    order_by: Optional[list] = None,
+    no_cache: bool = False,
+    raw: bool = False,
 ) -> dict:
     """
     Fetches keyword ideas based on seed keywords using DataForSEO Keyword Ideas API.
@@ -205,6 +647,8 @@ def getKeywordIdeas(
             [["keyword_info.search_volume", ">", 100], "and", ["keyword_info.competition_level", "=", "LOW"]]
         order_by (list, optional): Array of order conditions. Example:
             ["keyword_info.search_volume,desc"]
+        no_cache (bool): Bypass the cached response and fetch fresh data (default False).
+        raw (bool): Return DataForSEO's items unchanged instead of the flattened shape (default False).
     
     Returns:
         dict: Contains 'total_count', 'items_count', and 'items' array with keyword ideas.
@@ -223,15 +667,11 @@ def getKeywordIdeas(
     # DataForSEO API endpoint for Keyword Ideas
     url = "https://api.dataforseo.com/v3/dataforseo_labs/google/keyword_ideas/live"
     
-    # Retrieve DataForSEO Base64 authorization key from environment variable
-    api_key_base64 = os.getenv("DATAFORSEO_API_KEY")
-    
-    if not api_key_base64:
-        raise ValueError("DATAFORSEO_API_KEY environment variable is not set.")
-    
     # Validate inputs
-    if not keywords or len(keywords) == 0:
+    keywords = _clean_keywords(keywords)
+    if not keywords:
         raise ValueError("At least one seed keyword is required.")
+    _validate_dfs_locale(location_code, language_code)
     
     if len(keywords) > 20:
         raise ValueError("Maximum 20 seed keywords allowed.")
@@ -259,71 +699,49 @@ def getKeywordIdeas(
     
     payload = [payload_item]
     
-    # Make the POST request
-    headers = {
-        "Content-Type": "application/json",
-        "Authorization": f"Basic {api_key_base64}"
-    }
-    
-    response = requests.post(url, headers=headers, json=payload)
-    
-    # Check for successful response
-    if response.status_code != 200:
-        raise Exception(f"DataForSEO API request failed with status code {response.status_code}: {response.text}")
-    
-    # Parse the response
-    data = response.json()
+    # Seed order, case and spacing don't change the ideas returned, so collapse them in the cache key
+    cache_payload = [{**payload_item, "keywords": sorted({_normalize_keyword(k) for k in keywords})}]
+    result_list = await _dfs_call(url, payload, no_cache=no_cache, cache_payload=cache_payload)
+    if not result_list:
+        return {
+            "total_count": 0,
+            "items_count": 0,
+            "items": [],
+            "seed_keywords": keywords
+        }
     
     try:
-        if 'tasks' not in data or not data['tasks']:
-            raise Exception("No tasks in DataForSEO API response")
-        
-        task = data['tasks'][0]
-        
-        if task.get('status_code') != 20000:
-            status_code = task.get('status_code')
-            status_message = task.get('status_message', 'Unknown error')
-            raise Exception(f"DataForSEO API error: {status_code} - {status_message}")
-        
-        if 'result' not in task or not task['result']:
-            return {
-                "total_count": 0,
-                "items_count": 0,
-                "items": [],
-                "seed_keywords": keywords
-            }
-        
-        result = task['result'][0]
+        result = result_list[0]
         
         # Extract and format items
-        items = result.get('items', [])
-        formatted_items = []
-        
-        for item in items:
-            keyword_info = item.get('keyword_info', {})
-            keyword_properties = item.get('keyword_properties', {})
-            search_intent_info = item.get('search_intent_info', {})
-            serp_info = item.get('serp_info', {})
-            
-            formatted_item = {
-                "keyword": item.get('keyword'),
-                "search_volume": keyword_info.get('search_volume'),
-                "competition": keyword_info.get('competition'),
-                "competition_level": keyword_info.get('competition_level'),
-                "cpc": keyword_info.get('cpc'),
-                "low_top_of_page_bid": keyword_info.get('low_top_of_page_bid'),
-                "high_top_of_page_bid": keyword_info.get('high_top_of_page_bid'),
-                "keyword_difficulty": keyword_properties.get('keyword_difficulty'),
-                "main_intent": search_intent_info.get('main_intent'),
-                "monthly_searches": keyword_info.get('monthly_searches', [])[:6],  # Last 6 months
-            }
-            
-            # Include SERP info if available
-            if include_serp_info and serp_info:
-                formatted_item["serp_item_types"] = serp_info.get('serp_item_types', [])
-                formatted_item["se_results_count"] = serp_info.get('se_results_count')
+        items = result.get('items') or []
+        if raw:
+            formatted_items = items
+        else:
+            formatted_items = []
+            append = formatted_items.append
+            fields = _KEYWORD_IDEA_INFO_FIELDS
             
-            formatted_items.append(formatted_item)
+            for item in items:
+                get = item.get
+                keyword_info = get('keyword_info') or _EMPTY
+                info_get = keyword_info.get
+                serp_info = get('serp_info')
+                
+                formatted_item = {
+                    "keyword": get('keyword'),
+                    **{k: info_get(k) for k in fields},
+                    "keyword_difficulty": (get('keyword_properties') or _EMPTY).get('keyword_difficulty'),
+                    "main_intent": (get('search_intent_info') or _EMPTY).get('main_intent'),
+                    "monthly_searches": (info_get('monthly_searches') or [])[:6],  # Last 6 months
+                }
+                
+                # Include SERP info if available
+                if include_serp_info and serp_info:
+                    formatted_item["serp_item_types"] = serp_info.get('serp_item_types', [])
+                    formatted_item["se_results_count"] = serp_info.get('se_results_count')
+                
+                append(formatted_item)
         
         return {
             "total_count": result.get('total_count', 0),
@@ -334,17 +752,30 @@ def getKeywordIdeas(
             "language_code": language_code
         }
         
-    except (KeyError, IndexError, TypeError) as e:
-        raise Exception(f"Unexpected response structure from DataForSEO API: {e}. Response: {data}")
+    except (KeyError, IndexError, TypeError, AttributeError) as e:
+        raise Exception(f"Unexpected response structure from DataForSEO API: {e}. Result: {result_list}")
+
+
+# Static parts of the ad_traffic_by_keywords task; copied and filled in per call.
+# Note: According to DataForSEO docs, use a high bid value to level other factors
+_AD_TRAFFIC_PROTO = MappingProxyType({
+    "bid": 1.0,  # Required field - use high value for accurate forecasting
+    "match": "broad",  # Required field - keyword match type: exact, phrase, or broad
+})
+
+# keyword_info fields copied straight through by google_ads_keyword_planner (before the CPC range)
+_PLANNER_KEYWORD_INFO_FIELDS = ("search_volume", "competition", "competition_level", "competition_index", "cpc")
 
 
 @mcp.tool
-def google_ads_keyword_planner(
+async def google_ads_keyword_planner(
     keywords: list[str],
     location_code: int = 2840,
     language_code: str = "en",
     date_from: Optional[str] = None,
-    date_to: Optional[str] = None
+    date_to: Optional[str] = None,
+    no_cache: bool = False,
+    raw: bool = False,
 ) -> dict:
     """
     Fetches Google Ads keyword planner data including CPC, impressions, clicks, cost, and position data.
@@ -360,6 +791,9 @@ def google_ads_keyword_planner(
         language_code (str): Language code (default "en" for English).
         date_from (str, optional): Start date in YYYY-MM-DD format. If not provided, uses default period.
         date_to (str, optional): End date in YYYY-MM-DD format. If not provided, uses default period.
+        no_cache (bool): Bypass the cached response and fetch fresh data (default False).
+        raw (bool): Return DataForSEO's task result unchanged under 'result' instead of
+                    the per-keyword 'items' shape below (default False).
     
     Returns:
         dict: Contains 'total_count', 'items_count', and 'items' array with keyword data.
@@ -388,28 +822,18 @@ def google_ads_keyword_planner(
     # DataForSEO API endpoint for Google Ads Ad Traffic By Keywords
     url = "https://api.dataforseo.com/v3/keywords_data/google_ads/ad_traffic_by_keywords/live"
     
-    # Retrieve DataForSEO Base64 authorization key from environment variable
-    api_key_base64 = os.getenv("DATAFORSEO_API_KEY")
-    
-    if not api_key_base64:
-        raise ValueError("DATAFORSEO_API_KEY environment variable is not set.")
-    
     # Validate inputs
-    if not keywords or len(keywords) == 0:
+    keywords = _clean_keywords(keywords)
+    if not keywords:
         raise ValueError("At least one keyword is required.")
+    _validate_dfs_locale(location_code, language_code)
     
     if len(keywords) > 1000:
         raise ValueError("Maximum 1000 keywords allowed per request.")
     
     # Prepare the payload - ad_traffic_by_keywords endpoint structure
-    # Note: According to DataForSEO docs, use a high bid value to level other factors
-    payload_item = {
-        "keywords": keywords,
-        "location_code": location_code,
-        "language_code": language_code,
-        "bid": 1.0,  # Required field - use high value for accurate forecasting
-        "match": "broad",  # Required field - keyword match type: exact, phrase, or broad
-    }
+    payload_item = _AD_TRAFFIC_PROTO.copy()
+    payload_item.update(keywords=keywords, location_code=location_code, language_code=language_code)
     
     # Add optional date range if provided
     if date_from:
@@ -419,73 +843,55 @@ def google_ads_keyword_planner(
     
     payload = [payload_item]
     
-    # Make the POST request
-    headers = {
-        "Content-Type": "application/json",
-        "Authorization": f"Basic {api_key_base64}"
-    }
-    
-    response = requests.post(url, headers=headers, json=payload)
-    
-    # Check for successful response
-    if response.status_code != 200:
-        raise Exception(f"DataForSEO API request failed with status code {response.status_code}: {response.text}")
-    
-    # Parse the response
-    data = response.json()
+    result_list = await _dfs_call(url, payload, no_cache=no_cache)
+    if not result_list:
+        return {
+            "total_count": 0,
+            "items_count": 0,
+            "items": [],
+            "keywords": keywords,
+            "location_code": location_code,
+            "language_code": language_code
+        }
     
     try:
-        if 'tasks' not in data or not data['tasks']:
-            raise Exception("No tasks in DataForSEO API response")
-        
-        task = data['tasks'][0]
-        
-        if task.get('status_code') != 20000:
-            status_code = task.get('status_code')
-            status_message = task.get('status_message', 'Unknown error')
-            raise Exception(f"DataForSEO API error: {status_code} - {status_message}")
+        # The ad_traffic_by_keywords endpoint returns aggregated data directly in result
+        # Structure: result contains data at top level, not in items array
+        result = result_list[0]
         
-        if 'result' not in task or not task['result']:
+        if raw:
             return {
-                "total_count": 0,
-                "items_count": 0,
-                "items": [],
+                "result": result,
                 "keywords": keywords,
                 "location_code": location_code,
-                "language_code": language_code
+                "language_code": language_code,
             }
         
-        # The ad_traffic_by_keywords endpoint returns aggregated data directly in result
-        # Structure: result contains data at top level, not in items array
-        result = task['result'][0]
-        
         # Check if result has items array (individual keyword data) or aggregated data
-        if result.get('items') and len(result.get('items', [])) > 0:
+        items = result.get('items')
+        if items:
             # Individual keyword data structure
-            items = result.get('items', [])
             formatted_items = []
             
             for item in items:
-                keyword_info = item.get('keyword_info', {})
-                ad_traffic = item.get('ad_traffic', {})
+                keyword_info = item.get('keyword_info') or {}
+                ad_traffic = item.get('ad_traffic') or {}
+                info_get = keyword_info.get
+                traffic_get = ad_traffic.get
                 
                 formatted_item = {
                     "keyword": item.get('keyword'),
-                    "search_volume": keyword_info.get('search_volume'),
-                    "competition": keyword_info.get('competition'),
-                    "competition_level": keyword_info.get('competition_level'),
-                    "competition_index": keyword_info.get('competition_index'),
-                    "cpc": keyword_info.get('cpc'),
-                    "cpc_min": keyword_info.get('cpc_min') or ad_traffic.get('cpc_min'),
-                    "cpc_max": keyword_info.get('cpc_max') or ad_traffic.get('cpc_max'),
-                    "low_top_of_page_bid": keyword_info.get('low_top_of_page_bid'),
-                    "high_top_of_page_bid": keyword_info.get('high_top_of_page_bid'),
-                    "ad_position": ad_traffic.get('ad_position_average') or ad_traffic.get('ad_position'),
-                    "impressions": ad_traffic.get('impressions') or ad_traffic.get('daily_impressions_average'),
-                    "clicks": ad_traffic.get('clicks') or ad_traffic.get('daily_clicks_average'),
+                    **{k: info_get(k) for k in _PLANNER_KEYWORD_INFO_FIELDS},
+                    "cpc_min": info_get('cpc_min') or traffic_get('cpc_min'),
+                    "cpc_max": info_get('cpc_max') or traffic_get('cpc_max'),
+                    "low_top_of_page_bid": info_get('low_top_of_page_bid'),
+                    "high_top_of_page_bid": info_get('high_top_of_page_bid'),
+                    "ad_position": traffic_get('ad_position_average') or traffic_get('ad_position'),
+                    "impressions": traffic_get('impressions') or traffic_get('daily_impressions_average'),
+                    "clicks": traffic_get('clicks') or traffic_get('daily_clicks_average'),
                 }
                 
-                cost_micros = ad_traffic.get('cost_micros') or ad_traffic.get('daily_cost_average')
+                cost_micros = traffic_get('cost_micros') or traffic_get('daily_cost_average')
                 if cost_micros:
                     formatted_item["cost_micros"] = cost_micros
                     formatted_item["cost_usd"] = cost_micros / 1_000_000 if isinstance(cost_micros, (int, float)) else None
@@ -542,30 +948,24 @@ def google_ads_keyword_planner(
             "bid": result.get('bid'),
         }
         
-    except (KeyError, IndexError, TypeError) as e:
-        raise Exception(f"Unexpected response structure from DataForSEO API: {e}. Response: {data}")
+    except (KeyError, IndexError, TypeError, AttributeError) as e:
+        raise Exception(f"Unexpected response structure from DataForSEO API: {e}. Result: {result_list}")
 
 
-def _parse_keywords_data_result(data: dict) -> list[dict]:
-    """Extract list of { keyword, search_volume?, cpc?, competition? } from DataForSEO keywords_data task result."""
-    tasks = data.get("tasks") or []
-    if not tasks:
-        raise ValueError("DataForSEO API returned no tasks")
-    task = tasks[0]
-    if task.get("status_code") != 20000:
-        raise ValueError(
-            f"DataForSEO API error: {task.get('status_code')} - {task.get('status_message', 'Unknown')}"
-        )
-    result_list = task.get("result") or []
+def _parse_keywords_data_result(result_list: list, limit: Optional[int] = None) -> tuple[list[dict], int]:
+    """
+    Extract list of { keyword, search_volume?, cpc?, competition? } from a DataForSEO keywords_data task result.
+    Only the first `limit` items are reshaped; returns (items, total items in the result).
+    """
     out = []
-    for item in result_list:
+    for item in result_list[:limit]:
         out.append({
             "keyword": item.get("keyword") or "",
             "search_volume": item.get("search_volume"),
             "cpc": item.get("cpc"),
             "competition": item.get("competition"),
         })
-    return out
+    return out, len(result_list)
 
 
 # Hard caps on MCP return size to avoid flooding model context (caller limit is capped by these)
@@ -574,11 +974,12 @@ MAX_KEYWORDS_FOR_KEYWORDS_RETURN = 100
 
 
 @mcp.tool
-def keywords_for_site(
+async def keywords_for_site(
     url: str,
     location_code: int,
     language_code: str = "en",
     limit: Optional[int] = 50,
+    no_cache: bool = False,
 ) -> dict:
     """
     Get keywords relevant to a site or page using DataForSEO Google Ads Keywords For Site API.
@@ -589,34 +990,37 @@ def keywords_for_site(
         location_code: DataForSEO location code (e.g. 2840 US, 2124 Canada).
         language_code: Language code (default en).
         limit: Max number of keywords to return (default 50). Capped at %s to avoid context overflow.
+        no_cache: Bypass the cached response and fetch fresh data (default False).
 
     Returns:
         { seeds: Array<{ keyword, search_volume?, cpc?, competition? }>, total_available: N }
     """ % MAX_KEYWORDS_FOR_SITE_RETURN
     if not url or not url.strip():
         return {"seeds": [], "total_available": 0}
+    _validate_dfs_locale(location_code, language_code)
     target = url.strip()
     payload = [{
         "target": target,
         "location_code": location_code,
         "language_code": language_code,
+        "sort_by": "search_volume",  # highest-volume first, so the cap keeps the best seeds
     }]
-    data = _dataforseo_keywords_post("keywords_for_site/live", payload)
     try:
-        items = _parse_keywords_data_result(data)
-    except ValueError:
+        result_list = await _dataforseo_keywords_post("keywords_for_site/live", payload, no_cache=no_cache)
+    except DataForSEOTaskError:
         return {"seeds": [], "total_available": 0}
     cap = min(max(1, limit if limit is not None else 50), MAX_KEYWORDS_FOR_SITE_RETURN)
-    seeds = items[:cap]
-    return {"seeds": seeds, "total_available": len(items)}
+    seeds, total = _parse_keywords_data_result(result_list, cap)
+    return {"seeds": seeds, "total_available": total}
 
 
 @mcp.tool
-def keywords_for_keywords(
+async def keywords_for_keywords(
     keywords: list[str],
     location_code: int,
     language_code: str = "en",
     limit: Optional[int] = 200,
+    no_cache: bool = False,
 ) -> dict:
     """
     Get keyword suggestions for given seed keywords using DataForSEO Google Ads Keywords For Keywords API.
@@ -627,88 +1031,135 @@ def keywords_for_keywords(
         location_code: DataForSEO location code (e.g. 2840 US, 2124 Canada).
         language_code: Language code (default en).
         limit: Max number of suggestions to return (default 200). Capped at %s to avoid context overflow.
+        no_cache: Bypass the cached response and fetch fresh data (default False).
 
     Returns:
         { suggestions: Array<{ keyword, search_volume?, cpc?, competition? }>, total_available: N }
     """ % MAX_KEYWORDS_FOR_KEYWORDS_RETURN
+    keywords = _clean_keywords(keywords)
     if not keywords:
         return {"suggestions": [], "total_available": 0}
+    _validate_dfs_locale(location_code, language_code)
     payload = [{
         "keywords": keywords[:20],
         "location_code": location_code,
         "language_code": language_code,
+        "sort_by": "search_volume",  # highest-volume first, so the cap keeps the best suggestions
     }]
-    data = _dataforseo_keywords_post("keywords_for_keywords/live", payload)
     try:
-        items = _parse_keywords_data_result(data)
-    except ValueError:
+        result_list = await _dataforseo_keywords_post("keywords_for_keywords/live", payload, no_cache=no_cache)
+    except DataForSEOTaskError:
         return {"suggestions": [], "total_available": 0}
     limit_val = limit if limit is not None else 200
     cap = min(max(1, limit_val), MAX_KEYWORDS_FOR_KEYWORDS_RETURN)
-    suggestions = items[:cap]
-    return {"suggestions": suggestions, "total_available": len(items)}
+    suggestions, total = _parse_keywords_data_result(result_list, cap)
+    return {"suggestions": suggestions, "total_available": total}
+
+
+# Lookup indexes for the hot tool queries. html_artifacts deliberately leaves html out
+# of the index (no INCLUDE): rows are large and a heap fetch per lookup is cheap. The
+# same index serves writeHTML's MAX(version_number) as a backward index-only scan, so
+# no separate DESC index is needed.
+# Built CONCURRENTLY so startup never blocks writes from the arb backend on these tables.
+# Index name -> DDL; the name is also used to find and drop an INVALID leftover
+INDEX_SQL = {
+    "ix_keyword_ideas_client_lower_keyword": """
+    CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_keyword_ideas_client_lower_keyword
+    ON keyword_ideas (client_id, LOWER(keyword));
+    """,
+    "ix_html_artifacts_lookup": """
+    CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_html_artifacts_lookup
+    ON html_artifacts (client_id, blog_idea_id, version_number);
+    """,
+}
+# A failed or interrupted CREATE INDEX CONCURRENTLY leaves an INVALID index that
+# IF NOT EXISTS would skip forever
+_INVALID_INDEX_SQL = text("""
+    SELECT 1 FROM pg_index
+    WHERE indexrelid = to_regclass(:name) AND NOT indisvalid
+""")
+# Blog HTML is TOASTed (compressed at rest) by Postgres; lz4 is much faster than the default
+# pglz on both writeHTML and readHTML. Applies to values written after the change (Postgres 14+).
+COMPRESSION_SQL = (
+    "ALTER TABLE html_artifacts ALTER COLUMN html SET COMPRESSION lz4",
+)
+
+def _ensure_indexes():
+    """Ensure the indexes used by addKeyword and readHTML/writeHTML exist."""
+    if not _engine:
+        return
+    for name, sql in INDEX_SQL.items():
+        try:
+            # CREATE/DROP INDEX CONCURRENTLY cannot run inside a transaction
+            with _db_reader() as conn:
+                if conn.execute(_INVALID_INDEX_SQL, {"name": name}).fetchone():
+                    logger.warning("Rebuilding invalid index %s", name)
+                    conn.execute(text(f"DROP INDEX CONCURRENTLY IF EXISTS {name}"))
+                conn.execute(text(sql))
+        except Exception as e:
+            logger.warning("Could not create index: %s", e)
+
+
+def _ensure_compression():
+    """Switch large text columns used by writeHTML/readHTML to lz4 compression."""
+    if not _engine:
+        return
+    for sql in COMPRESSION_SQL:
+        try:
+            with _db_writer() as conn:
+                conn.execute(text(sql))
+        except Exception as e:
+            logger.warning("Could not set column compression: %s", e)
+
+
+_ADD_KEYWORD_SQL = text("""
+    WITH existing AS (
+        SELECT id FROM keyword_ideas
+        WHERE client_id = :client_id AND LOWER(keyword) = LOWER(:keyword)
+        LIMIT 1
+    ), inserted AS (
+        INSERT INTO keyword_ideas (client_id, keyword, source, search_volume, keyword_difficulty, created_at, updated_at)
+        SELECT :client_id, :keyword, 'ai', :search_volume, :keyword_difficulty, NOW(), NOW()
+        WHERE NOT EXISTS (SELECT 1 FROM existing)
+        RETURNING id
+    )
+    SELECT id, TRUE AS inserted FROM inserted
+    UNION ALL
+    SELECT id, FALSE AS inserted FROM existing
+""")
 
 
-@mcp.tool
-def addKeyword(client_id: int, keyword: str, search_volume: Optional[int] = None, keyword_difficulty: Optional[int] = None) -> dict:
-    """
-    Adds a keyword to a client's keyword list.
-    
-    This tool allows The Brute or other agents to add keywords incrementally
-    while generating keyword ideas, preventing timeouts.
-    
-    Args:
-        client_id (int): The client ID.
-        keyword (str): The keyword to add.
-        search_volume (int, optional): Search volume for the keyword.
-        keyword_difficulty (int, optional): Keyword difficulty score.
-    
-    Returns:
-        dict: A dictionary containing status, client_id, keyword, and the created keyword_id.
-    """
-    db = get_db_session()
+def _add_keyword(client_id: int, keyword: str, search_volume: Optional[int] = None, keyword_difficulty: Optional[int] = None) -> dict:
+    """Insert a keyword idea for a client (blocking; run via asyncio.to_thread)."""
     try:
         # Validate keyword
         keyword = keyword.strip()
         if not keyword:
             raise ValueError("Keyword cannot be empty")
         
-        # Check if keyword already exists for this client
-        existing = db.execute(
-            text("""
-                SELECT id FROM keyword_ideas
-                WHERE client_id = :client_id AND LOWER(keyword) = LOWER(:keyword)
-            """),
-            {"client_id": client_id, "keyword": keyword}
-        ).fetchone()
-        
-        if existing:
+        with _db_writer() as conn:
+            # Look up and insert in one round-trip; the insert only fires when no
+            # case-insensitive match exists for this client
+            row = conn.execute(
+                _ADD_KEYWORD_SQL,
+                {
+                    "client_id": client_id,
+                    "keyword": keyword,
+                    "search_volume": search_volume,
+                    "keyword_difficulty": keyword_difficulty
+                }
+            ).fetchone()
+        
+        keyword_id, inserted = row
+        if not inserted:
             return {
                 "status": "already_exists",
                 "client_id": client_id,
                 "keyword": keyword,
-                "keyword_id": existing[0],
+                "keyword_id": keyword_id,
                 "message": f"Keyword '{keyword}' already exists for this client"
             }
         
-        # Insert new keyword
-        result = db.execute(
-            text("""
-                INSERT INTO keyword_ideas (client_id, keyword, source, search_volume, keyword_difficulty, created_at, updated_at)
-                VALUES (:client_id, :keyword, 'ai', :search_volume, :keyword_difficulty, NOW(), NOW())
-                RETURNING id
-            """),
-            {
-                "client_id": client_id,
-                "keyword": keyword,
-                "search_volume": search_volume,
-                "keyword_difficulty": keyword_difficulty
-            }
-        )
-        
-        keyword_id = result.fetchone()[0]
-        db.commit()
-        
         return {
             "status": "success",
             "client_id": client_id,
@@ -719,111 +1170,406 @@ def addKeyword(client_id: int, keyword: str, search_volume: Optional[int] = None
             "message": f"Successfully added keyword '{keyword}' to client {client_id}"
         }
     except Exception as e:
-        db.rollback()
         raise Exception(f"Failed to add keyword: {str(e)}")
-    finally:
-        db.close()
 
 
 @mcp.tool
-def readHTML(client_id: int, blog_id: int, version_number: int) -> dict:
+async def addKeyword(client_id: int, keyword: str, search_volume: Optional[int] = None, keyword_difficulty: Optional[int] = None) -> dict:
     """
-    Fetches a specific HTML version from the database.
+    Adds a keyword to a client's keyword list.
+    
+    This tool allows The Brute or other agents to add keywords incrementally
+    while generating keyword ideas, preventing timeouts.
     
     Args:
         client_id (int): The client ID.
-        blog_id (int): The blog idea ID.
-        version_number (int): The version number to fetch.
+        keyword (str): The keyword to add.
+        search_volume (int, optional): Search volume for the keyword.
+        keyword_difficulty (int, optional): Keyword difficulty score.
     
     Returns:
-        dict: A dictionary containing client_id, blog_id, version_number, and html.
+        dict: A dictionary containing status, client_id, keyword, and the created keyword_id.
     """
-    db = get_db_session()
+    return await asyncio.to_thread(_add_keyword, client_id, keyword, search_volume, keyword_difficulty)
+
+
+# Rows per multi-row INSERT in addKeywords
+ADD_KEYWORDS_CHUNK_SIZE = 500
+
+
+class KeywordItem(BaseModel):
+    """One keyword in addKeywords."""
+    model_config = ConfigDict(extra="forbid")
+
+    keyword: str = Field(description="The keyword to add.")
+    search_volume: Optional[int] = Field(None, description="Search volume for the keyword.")
+    keyword_difficulty: Optional[int] = Field(None, description="Keyword difficulty score.")
+
+
+_ADD_KEYWORDS_SQL = text("""
+    WITH input AS (
+        SELECT keyword, search_volume, keyword_difficulty
+        FROM unnest(
+            CAST(:keywords AS text[]),
+            CAST(:search_volumes AS integer[]),
+            CAST(:keyword_difficulties AS integer[])
+        ) AS t(keyword, search_volume, keyword_difficulty)
+    ), existing AS (
+        SELECT DISTINCT ON (LOWER(k.keyword)) k.id, LOWER(k.keyword) AS lower_keyword, i.keyword AS input_keyword
+        FROM keyword_ideas k
+        JOIN input i ON LOWER(k.keyword) = LOWER(i.keyword)
+        WHERE k.client_id = :client_id
+        ORDER BY LOWER(k.keyword), k.id
+    ), inserted AS (
+        INSERT INTO keyword_ideas (client_id, keyword, source, search_volume, keyword_difficulty, created_at, updated_at)
+        SELECT :client_id, i.keyword, 'ai', i.search_volume, i.keyword_difficulty, NOW(), NOW()
+        FROM input i
+        WHERE NOT EXISTS (SELECT 1 FROM existing e WHERE e.lower_keyword = LOWER(i.keyword))
+        RETURNING keyword, id
+    )
+    SELECT keyword, id, TRUE AS inserted FROM inserted
+    UNION ALL
+    SELECT input_keyword, id, FALSE AS inserted FROM existing
+""")
+
+
+def _add_keywords(client_id: int, items: list[KeywordItem]) -> dict:
+    """Insert many keyword ideas in one transaction (blocking; run via asyncio.to_thread)."""
+    # Validate and de-duplicate case-insensitively, keeping the first occurrence
+    keywords = [item.keyword.strip() for item in items]
+    rows = {}
+    for keyword, item in zip(keywords, items):
+        if not keyword:
+            raise ValueError("Keyword cannot be empty")
+        rows.setdefault(keyword.lower(), (keyword, item.search_volume, item.keyword_difficulty))
+    rows = list(rows.values())
+
     try:
-        result = db.execute(
-            text("""
-                SELECT client_id, blog_idea_id, version_number, html
-                FROM html_artifacts
-                WHERE client_id = :client_id
-                  AND blog_idea_id = :blog_id
-                  AND version_number = :version_number
-                LIMIT 1
-            """),
+        with _db_writer() as conn:
+            inserted, already_exists, ids = 0, 0, {}
+            for start in range(0, len(rows), ADD_KEYWORDS_CHUNK_SIZE):
+                chunk = rows[start:start + ADD_KEYWORDS_CHUNK_SIZE]
+                result = conn.execute(
+                    _ADD_KEYWORDS_SQL,
+                    {
+                        "client_id": client_id,
+                        "keywords": [r[0] for r in chunk],
+                        "search_volumes": [r[1] for r in chunk],
+                        "keyword_difficulties": [r[2] for r in chunk],
+                    }
+                ).fetchall()
+                for keyword, keyword_id, was_inserted in result:
+                    ids[keyword.lower()] = keyword_id
+                    if was_inserted:
+                        inserted += 1
+                    else:
+                        already_exists += 1
+
+        return {
+            "status": "success",
+            "client_id": client_id,
+            "inserted": inserted,
+            "already_exists": already_exists,
+            # Every submitted keyword (as stripped) -> its keyword_ideas id, new or existing
+            "keyword_ids": {keyword: ids.get(keyword.lower()) for keyword in keywords},
+            "message": f"Added {inserted} keywords to client {client_id} ({already_exists} already existed)"
+        }
+    except Exception as e:
+        raise Exception(f"Failed to add keywords: {str(e)}")
+
+
+@mcp.tool
+async def addKeywords(client_id: int, items: list[KeywordItem]) -> dict:
+    """
+    Adds many keywords to a client's keyword list in a single transaction.
+    
+    Prefer this over repeated addKeyword calls when a batch of keyword ideas is ready.
+    Keywords that already exist for the client (case-insensitive) are skipped.
+    
+    Args:
+        client_id (int): The client ID.
+        items (list[KeywordItem]): Keywords to add; each has 'keyword' and optional
+                                   'search_volume' and 'keyword_difficulty' (integers).
+    
+    Returns:
+        dict: A dictionary containing status, client_id, inserted and already_exists counts,
+              and keyword_ids mapping each submitted keyword to its keyword_id.
+    """
+    return await asyncio.to_thread(_add_keywords, client_id, items)
+
+
+_READ_HTML_SQL = text("""
+    SELECT client_id, blog_idea_id AS blog_id, version_number, html
+    FROM html_artifacts
+    WHERE client_id = :client_id
+      AND blog_idea_id = :blog_id
+      AND version_number = :version_number
+    LIMIT 1
+""")
+
+
+def _read_html(client_id: int, blog_id: int, version_number: int) -> dict:
+    """
+    Fetch one html_artifacts row (blocking; run via asyncio.to_thread).
+    Uses a bare autocommit connection rather than a Session: a single SELECT needs no
+    transaction. Writes (writeHTML, addKeyword) use a _db_writer transaction.
+    """
+    with _db_reader() as conn:
+        result = conn.execute(
+            _READ_HTML_SQL,
             {"client_id": client_id, "blog_id": blog_id, "version_number": version_number}
-        ).fetchone()
+        ).mappings().first()
         
         if not result:
             raise ValueError(f"HTML artifact not found for client_id={client_id}, blog_id={blog_id}, version_number={version_number}")
         
-        return {
-            "client_id": result[0],
-            "blog_id": result[1],
-            "version_number": result[2],
-            "html": result[3]
-        }
-    finally:
-        db.close()
+        # Selected columns are aliased to the tool's return keys
+        return dict(result)
 
 
 @mcp.tool
-def writeHTML(client_id: int, blog_id: int, version_number: int, html: str) -> dict:
+async def readHTML(client_id: int, blog_id: int, version_number: int) -> dict:
     """
-    Writes HTML to the database. The version number must be one higher than the current maximum version.
+    Fetches a specific HTML version from the database.
     
     Args:
         client_id (int): The client ID.
         blog_id (int): The blog idea ID.
-        version_number (int): The new version number (must be current_max + 1).
-        html (str): The HTML content to store.
+        version_number (int): The version number to fetch.
     
     Returns:
-        dict: A dictionary containing client_id, blog_id, and the updated version_number.
+        dict: A dictionary containing client_id, blog_id, version_number, and html.
     """
-    db = get_db_session()
-    try:
-        # Get the current maximum version number
-        max_version_result = db.execute(
-            text("""
-                SELECT COALESCE(MAX(version_number), 0)
-                FROM html_artifacts
-                WHERE client_id = :client_id AND blog_idea_id = :blog_id
-            """),
-            {"client_id": client_id, "blog_id": blog_id}
-        ).fetchone()
-        
-        current_max_version = max_version_result[0] if max_version_result else 0
-        expected_version = current_max_version + 1
-        
-        if version_number != expected_version:
+    return await asyncio.to_thread(_read_html, client_id, blog_id, version_number)
+
+
+# Upper bound on versions per readHTMLVersions call
+MAX_HTML_VERSIONS = 50
+
+_READ_HTML_VERSIONS_SQL = text("""
+    SELECT DISTINCT ON (version_number) client_id, blog_idea_id AS blog_id, version_number, html
+    FROM html_artifacts
+    WHERE client_id = :client_id
+      AND blog_idea_id = :blog_id
+      AND version_number = ANY(:version_numbers)
+    ORDER BY version_number
+""")
+
+
+def _read_html_versions(client_id: int, blog_id: int, version_numbers: list[int]) -> dict:
+    """Fetch several html_artifacts versions in one query (blocking; run via asyncio.to_thread)."""
+    with _db_reader() as conn:
+        rows = conn.execute(
+            _READ_HTML_VERSIONS_SQL,
+            {"client_id": client_id, "blog_id": blog_id, "version_numbers": version_numbers}
+        ).mappings().all()
+    found = {row["version_number"]: dict(row) for row in rows}
+    return {
+        "items": [found[v] for v in version_numbers if v in found],
+        "missing_versions": [v for v in version_numbers if v not in found],
+    }
+
+
+@mcp.tool
+async def readHTMLVersions(client_id: int, blog_id: int, version_numbers: list[int]) -> dict:
+    """
+    Fetches several HTML versions of a blog in one database round trip.
+    Use this instead of repeated readHTML calls, e.g. to compare drafts.
+    
+    Args:
+        client_id (int): The client ID.
+        blog_id (int): The blog idea ID.
+        version_numbers (list[int]): The version numbers to fetch (max 50).
+    
+    Returns:
+        dict: 'items' in the requested order, each with client_id, blog_id, version_number and html,
+              plus 'missing_versions' for versions that don't exist.
+    """
+    if not version_numbers:
+        raise ValueError("At least one version number is required.")
+    version_numbers = list(dict.fromkeys(version_numbers))
+    if len(version_numbers) > MAX_HTML_VERSIONS:
+        raise ValueError(f"Maximum {MAX_HTML_VERSIONS} versions allowed per request.")
+    return await asyncio.to_thread(_read_html_versions, client_id, blog_id, version_numbers)
+
+
+# Serializes all html_artifacts writers (writeHTML, writeHTMLNextVersion) per blog for the rest of
+# the transaction. It must be its own statement: under READ COMMITTED the INSERT's MAX() snapshot
+# is taken when that statement starts, so it has to start after the lock is held.
+_HTML_WRITE_LOCK_SQL = text(
+    "SELECT pg_advisory_xact_lock(hashtextextended('html_artifacts:' || :client_id || ':' || :blog_id, 0))"
+)
+_WRITE_HTML_SQL = text("""
+    INSERT INTO html_artifacts (client_id, blog_idea_id, version_number, html)
+    SELECT :client_id, :blog_id, :version_number, :html
+    FROM (
+        SELECT COALESCE(MAX(version_number), 0) AS current_max
+        FROM html_artifacts
+        WHERE client_id = :client_id AND blog_idea_id = :blog_id
+    ) AS latest
+    WHERE latest.current_max + 1 = :version_number
+    RETURNING version_number
+""")
+
+_HTML_MAX_VERSION_SQL = text("""
+    SELECT COALESCE(MAX(version_number), 0)
+    FROM html_artifacts
+    WHERE client_id = :client_id AND blog_idea_id = :blog_id
+""")
+
+
+def _write_html(client_id: int, blog_id: int, version_number: int, html: str) -> dict:
+    """Insert the next html_artifacts version (blocking; run via asyncio.to_thread)."""
+    params = {"client_id": client_id, "blog_id": blog_id, "version_number": version_number, "html": html}
+    with _db_writer() as conn:
+        # The lock, not the single statement, is what stops two writers from both
+        # seeing the same MAX and inserting the same version
+        conn.execute(_HTML_WRITE_LOCK_SQL, params)
+        # Check the version and insert: the row is only written when version_number
+        # is exactly the current max + 1
+        inserted = conn.execute(
+            _WRITE_HTML_SQL,
+            params
+        ).scalar()
+        
+        if inserted is None:
+            # Mismatch: look up the current max only to explain the error
+            current_max_version = conn.execute(
+                _HTML_MAX_VERSION_SQL,
+                params
+            ).scalar()
+            expected_version = current_max_version + 1
             raise ValueError(
                 f"Version number mismatch. Expected version {expected_version} "
                 f"(current max is {current_max_version}), but got {version_number}"
             )
-        
-        # Insert the new HTML artifact
-        db.execute(
-            text("""
-                INSERT INTO html_artifacts (client_id, blog_idea_id, version_number, html)
-                VALUES (:client_id, :blog_id, :version_number, :html)
-            """),
-            {"client_id": client_id, "blog_id": blog_id, "version_number": version_number, "html": html}
-        )
-        db.commit()
-        
-        return {
-            "client_id": client_id,
-            "blog_id": blog_id,
-            "version_number": version_number
-        }
-    except Exception as e:
-        db.rollback()
-        raise
-    finally:
-        db.close()
+    
+    return {
+        "client_id": client_id,
+        "blog_id": blog_id,
+        "version_number": inserted
+    }
+
+
+@mcp.tool
+async def writeHTML(client_id: int, blog_id: int, version_number: int, html: str) -> dict:
+    """
+    Writes HTML to the database. The version number must be one higher than the current maximum version.
+    
+    Args:
+        client_id (int): The client ID.
+        blog_id (int): The blog idea ID.
+        version_number (int): The new version number (must be current_max + 1).
+        html (str): The HTML content to store.
+    
+    Returns:
+        dict: A dictionary containing client_id, blog_id, and the updated version_number.
+    """
+    return await asyncio.to_thread(_write_html, client_id, blog_id, version_number, html)
+
+
+_WRITE_HTML_NEXT_SQL = text("""
+    INSERT INTO html_artifacts (client_id, blog_idea_id, version_number, html)
+    SELECT :client_id, :blog_id, COALESCE(MAX(version_number), 0) + 1, :html
+    FROM html_artifacts
+    WHERE client_id = :client_id AND blog_idea_id = :blog_id
+    RETURNING version_number
+""")
+
+
+def _write_html_next(client_id: int, blog_id: int, html: str) -> dict:
+    """Insert html as the blog's next version (blocking; run via asyncio.to_thread)."""
+    params = {"client_id": client_id, "blog_id": blog_id, "html": html}
+    with _db_writer() as conn:
+        conn.execute(_HTML_WRITE_LOCK_SQL, params)
+        inserted = conn.execute(_WRITE_HTML_NEXT_SQL, params).scalar_one()
+    
+    return {
+        "client_id": client_id,
+        "blog_id": blog_id,
+        "version_number": inserted
+    }
+
+
+@mcp.tool
+async def writeHTMLNextVersion(client_id: int, blog_id: int, html: str) -> dict:
+    """
+    Writes HTML to the database as the next version (current maximum + 1), chosen by the database.
+    Use this instead of writeHTML when you don't already know the current version number.
+    
+    Args:
+        client_id (int): The client ID.
+        blog_id (int): The blog idea ID.
+        html (str): The HTML content to store.
+    
+    Returns:
+        dict: A dictionary containing client_id, blog_id, and the version_number that was written.
+    """
+    return await asyncio.to_thread(_write_html_next, client_id, blog_id, html)
+
+
+# Overview and writing-rule columns of general_contexts, fetched together so back-to-back
+# getClientOverview/getClientWritingRules calls cost one query
+_OVERVIEW_COLUMNS = (
+    "domain", "call_to_action", "about", "competitors", "ideal_target_market",
+    "company_details", "social_links",
+)
+_WRITING_RULES_COLUMNS = ("brand_pov", "brand_safety", "questionnaire", "author_tone", "author_rules")
+_GENERAL_CONTEXT_SQL = text(f"""
+    SELECT {", ".join(_OVERVIEW_COLUMNS + _WRITING_RULES_COLUMNS)}
+    FROM general_contexts
+    WHERE client_id = :client_id
+""")
+
+# Client context changes rarely; a short TTL keeps repeated reads off the DB
+_general_context_cache = TTLCache(maxsize=512, ttl=30)
+# Client IDs with no general_contexts row; repeated probes of unknown IDs skip the DB
+_missing_general_context = TTLCache(maxsize=10_000, ttl=60)
+_general_context_lock = threading.Lock()
+
+
+def _general_context_not_found(client_id: int) -> ValueError:
+    return ValueError(f"Client context not found for client_id={client_id}")
+
+
+def _fetch_general_context(client_id: int) -> dict:
+    """
+    Overview + writing-rule columns for a client, cached for 30s. Raises ValueError if no
+    row exists; misses are remembered for 60s.
+    """
+    with _general_context_lock:
+        cached = _general_context_cache.get(client_id)
+        missing = client_id in _missing_general_context
+    if cached is not None:
+        return cached
+    if missing:
+        raise _general_context_not_found(client_id)
+    with _db_reader() as conn:
+        result = conn.execute(_GENERAL_CONTEXT_SQL, {"client_id": client_id}).mappings().fetchone()
+    if not result:
+        with _general_context_lock:
+            _missing_general_context[client_id] = True
+        raise _general_context_not_found(client_id)
+    context = dict(result)
+    with _general_context_lock:
+        _general_context_cache[client_id] = context
+    return context
+
+
+async def _general_context(client_id: int) -> dict:
+    """Async wrapper for _fetch_general_context; cache hits and known misses skip the worker thread."""
+    with _general_context_lock:
+        cached = _general_context_cache.get(client_id)
+        missing = client_id in _missing_general_context
+    if cached is not None:
+        return cached
+    if missing:
+        raise _general_context_not_found(client_id)
+    return await asyncio.to_thread(_fetch_general_context, client_id)
 
 
 @mcp.tool
-def getClientOverview(client_id: int) -> dict:
+async def getClientOverview(client_id: int) -> dict:
     """
     Fetches client overview data from the general_contexts table (formerly client_contexts).
     
@@ -834,36 +1580,12 @@ def getClientOverview(client_id: int) -> dict:
         dict: A dictionary containing domain, call_to_action, about, competitors, 
               ideal_target_market, company_details, and social_links.
     """
-    db = get_db_session()
-    try:
-        result = db.execute(
-            text("""
-                SELECT domain, call_to_action, about, competitors, ideal_target_market, 
-                       company_details, social_links
-                FROM general_contexts
-                WHERE client_id = :client_id
-            """),
-            {"client_id": client_id}
-        ).fetchone()
-        
-        if not result:
-            raise ValueError(f"Client context not found for client_id={client_id}")
-        
-        return {
-            "domain": result[0],
-            "call_to_action": result[1],
-            "about": result[2],
-            "competitors": result[3],
-            "ideal_target_market": result[4],
-            "company_details": result[5],
-            "social_links": result[6]
-        }
-    finally:
-        db.close()
+    context = await _general_context(client_id)
+    return {k: context[k] for k in _OVERVIEW_COLUMNS}
 
 
 @mcp.tool
-def getClientWritingRules(client_id: int) -> dict:
+async def getClientWritingRules(client_id: int) -> dict:
     """
     Fetches client writing rules from the general_contexts table (formerly client_contexts).
     
@@ -874,53 +1596,41 @@ def getClientWritingRules(client_id: int) -> dict:
         dict: A dictionary containing brand_pov, brand_safety, questionnaire, 
               author_tone, and author_rules.
     """
-    db = get_db_session()
-    try:
-        result = db.execute(
-            text("""
-                SELECT brand_pov, brand_safety, questionnaire, author_tone, author_rules
-                FROM general_contexts
-                WHERE client_id = :client_id
-            """),
-            {"client_id": client_id}
-        ).fetchone()
-        
-        if not result:
-            raise ValueError(f"Client context not found for client_id={client_id}")
-        
-        return {
-            "brand_pov": result[0],
-            "brand_safety": result[1],
-            "questionnaire": result[2],
-            "author_tone": result[3],
-            "author_rules": result[4]
-        }
-    finally:
-        db.close()
+    context = await _general_context(client_id)
+    return {k: context[k] for k in _WRITING_RULES_COLUMNS}
 
 
 @mcp.tool
-def get_kw_sitemap(client_id: int) -> dict:
+async def getClient(client_id: int) -> dict:
     """
-    Fetches the keyword enhanced sitemap for a client from general_contexts.
-    The sitemap is stored as NDJSON (newline-delimited JSON) with one object per URL:
-    url, page_type, primary_keyword, secondary_keywords, notes, etc.
-
+    Fetches a client's overview and writing rules in one call from the general_contexts table.
+    
     Args:
         client_id (int): The client ID.
-
+    
     Returns:
-        dict: keyword_enhanced_sitemap_json (str or null), keyword_enhanced_sitemap_generated_at (ISO str or null).
-              If no context or no sitemap, json is null and generated_at is null.
+        dict: 'overview' (same fields as getClientOverview) and 'writing_rules'
+              (same fields as getClientWritingRules).
     """
-    db = get_db_session()
-    try:
-        result = db.execute(
-            text("""
-                SELECT keyword_enhanced_sitemap_json, keyword_enhanced_sitemap_generated_at
-                FROM general_contexts
-                WHERE client_id = :client_id
-            """),
+    context = await _general_context(client_id)
+    return {
+        "overview": {k: context[k] for k in _OVERVIEW_COLUMNS},
+        "writing_rules": {k: context[k] for k in _WRITING_RULES_COLUMNS},
+    }
+
+
+_KW_SITEMAP_SQL = text("""
+    SELECT keyword_enhanced_sitemap_json, keyword_enhanced_sitemap_generated_at
+    FROM general_contexts
+    WHERE client_id = :client_id
+""")
+
+
+def _get_kw_sitemap(client_id: int) -> dict:
+    """Fetch a client's keyword enhanced sitemap (blocking; run via asyncio.to_thread)."""
+    with _db_reader() as conn:
+        result = conn.execute(
+            _KW_SITEMAP_SQL,
             {"client_id": client_id}
         ).fetchone()
 
@@ -938,21 +1648,43 @@ def get_kw_sitemap(client_id: int) -> dict:
             "keyword_enhanced_sitemap_generated_at": generated_at.isoformat() if generated_at else None,
             "message": "No keyword enhanced sitemap yet. Run Sitemap then Keyword Enhanced Sitemap for this client." if not (json_val and json_val.strip()) else None,
         }
-    finally:
-        db.close()
 
 
-def _arb_backend_url() -> str:
-    """Base URL of the arb backend (for triggering KES job)."""
-    return (
-        os.getenv("ARB_BACKEND_URL")
-        or os.getenv("BACKEND_URL")
-        or "https://arb-production-8438.up.railway.app"
-    ).rstrip("/")
+@mcp.tool
+async def get_kw_sitemap(client_id: int) -> dict:
+    """
+    Fetches the keyword enhanced sitemap for a client from general_contexts.
+    The sitemap is stored as NDJSON (newline-delimited JSON) with one object per URL:
+    url, page_type, primary_keyword, secondary_keywords, notes, etc.
+
+    Args:
+        client_id (int): The client ID.
+
+    Returns:
+        dict: keyword_enhanced_sitemap_json (str or null), keyword_enhanced_sitemap_generated_at (ISO str or null).
+              If no context or no sitemap, json is null and generated_at is null.
+    """
+    return await asyncio.to_thread(_get_kw_sitemap, client_id)
+
+
+# Pooled keep-alive async client for the arb backend and Webflow calls (no automatic
+# retries: publish and retry endpoints are not idempotent)
+_backend_http = httpx.AsyncClient(
+    timeout=30.0,
+    limits=httpx.Limits(max_connections=32, max_keepalive_connections=32),
+)
+
+
+# Base URL of the arb backend (for triggering KES job)
+_ARB_BACKEND_URL = (
+    os.getenv("ARB_BACKEND_URL")
+    or os.getenv("BACKEND_URL")
+    or "https://arb-production-8438.up.railway.app"
+).rstrip("/")
 
 
 @mcp.tool
-def update_kw_sitemap(client_id: int) -> dict:
+async def update_kw_sitemap(client_id: int) -> dict:
     """
     Triggers an update (regeneration) of the keyword enhanced sitemap for a client.
     Calls the arb backend to run the Keyword Enhanced Sitemap job. The client must
@@ -965,11 +1697,11 @@ def update_kw_sitemap(client_id: int) -> dict:
     Returns:
         dict: job_id (str), message (str). On failure, error (str) and optional status_code.
     """
-    url = f"{_arb_backend_url()}/clients/{client_id}/context/keyword-enhanced-sitemap/retry"
+    url = f"{_ARB_BACKEND_URL}/clients/{client_id}/context/keyword-enhanced-sitemap/retry"
     try:
-        resp = requests.post(url, timeout=30)
-        data = resp.json() if resp.text else {}
-        if not resp.ok:
+        resp = await _backend_http.post(url, timeout=30)
+        data = orjson.loads(resp.content) if resp.content else {}
+        if not resp.is_success:
             detail = data.get("detail")
             if isinstance(detail, list) and detail:
                 detail = detail[0].get("msg", str(detail[0])) if isinstance(detail[0], dict) else str(detail[0])
@@ -986,7 +1718,7 @@ def update_kw_sitemap(client_id: int) -> dict:
             "job_id": job_id,
             "message": f"Keyword enhanced sitemap update started for client_id={client_id}. Poll GET /clients/{client_id}/context/keyword-enhanced-sitemap/status for status, then use get_kw_sitemap({client_id}) to read the result.",
         }
-    except requests.RequestException as e:
+    except (httpx.HTTPError, orjson.JSONDecodeError) as e:
         logger.exception("update_kw_sitemap request failed")
         return {
             "job_id": "",
@@ -995,51 +1727,39 @@ def update_kw_sitemap(client_id: int) -> dict:
         }
 
 
-@mcp.tool
-def get_webflow_pages(site_id: Optional[str] = None, client_id: Optional[int] = None) -> dict:
-    """
-    Returns the stored Webflow pages for a site. Pages are stored when a user runs
-    "Get all pages" in the Page Updater (AI panel). Provide either site_id (Webflow site ID)
-    or client_id (looked up from the clients table via client.site_id).
+_CLIENT_SITE_ID_SQL = text("SELECT site_id FROM clients WHERE id = :client_id")
+_WEBFLOW_PAGES_SQL = text("""
+    SELECT page_id, title, slug, published_path, collection_id, type
+    FROM webflow_pages WHERE site_id = :site_id ORDER BY id
+""")
 
-    Args:
-        site_id (str, optional): Webflow site ID.
-        client_id (int, optional): Client ID; site_id is looked up from clients.site_id.
 
-    Returns:
-        dict: site_id (str), pages (list of {page_id, title, slug, published_path, collection_id, type}).
-              On error, error (str) and optionally message.
-    """
+def _get_webflow_pages(site_id: Optional[str] = None, client_id: Optional[int] = None) -> dict:
+    """Fetch cached Webflow pages for a site or client (blocking; run via asyncio.to_thread)."""
     if not site_id and client_id is None:
         return {"site_id": "", "pages": [], "error": "Provide either site_id or client_id."}
     resolved_site_id = site_id
     if not resolved_site_id and client_id is not None:
-        db = get_db_session()
-        try:
-            row = db.execute(
-                text("SELECT site_id FROM clients WHERE id = :client_id"),
+        with _db_reader() as conn:
+            row = conn.execute(
+                _CLIENT_SITE_ID_SQL,
                 {"client_id": client_id},
             ).fetchone()
-            if not row or not row[0]:
-                return {
-                    "site_id": "",
-                    "pages": [],
-                    "error": f"No site_id found for client_id={client_id}. Confirm a site in Page Updater first.",
-                }
-            resolved_site_id = row[0]
-        finally:
-            db.close()
+        if not row or not row[0]:
+            return {
+                "site_id": "",
+                "pages": [],
+                "error": f"No site_id found for client_id={client_id}. Confirm a site in Page Updater first.",
+            }
+        resolved_site_id = row[0]
     if not resolved_site_id:
         return {"site_id": "", "pages": [], "error": "Could not resolve site_id."}
-    db = get_db_session()
     try:
-        rows = db.execute(
-            text("""
-                SELECT page_id, title, slug, published_path, collection_id, type
-                FROM webflow_pages WHERE site_id = :site_id ORDER BY id
-            """),
-            {"site_id": resolved_site_id},
-        ).fetchall()
+        with _db_reader() as conn:
+            rows = conn.execute(
+                _WEBFLOW_PAGES_SQL,
+                {"site_id": resolved_site_id},
+            ).fetchall()
         pages = [
             {
                 "page_id": r[0],
@@ -1060,26 +1780,46 @@ def get_webflow_pages(site_id: Optional[str] = None, client_id: Optional[int] =
             "error": str(e),
             "message": "Ensure webflow_pages table exists (run arb-v1 migrations).",
         }
-    finally:
-        db.close()
+
+
+@mcp.tool
+async def get_webflow_pages(site_id: Optional[str] = None, client_id: Optional[int] = None) -> dict:
+    """
+    Returns the stored Webflow pages for a site. Pages are stored when a user runs
+    "Get all pages" in the Page Updater (AI panel). Provide either site_id (Webflow site ID)
+    or client_id (looked up from the clients table via client.site_id).
+
+    Args:
+        site_id (str, optional): Webflow site ID.
+        client_id (int, optional): Client ID; site_id is looked up from clients.site_id.
+
+    Returns:
+        dict: site_id (str), pages (list of {page_id, title, slug, published_path, collection_id, type}).
+              On error, error (str) and optionally message.
+    """
+    return await asyncio.to_thread(_get_webflow_pages, site_id, client_id)
 
 
 # --- Webflow Page API (single page get/update; site publish) ---
 WEBFLOW_API_BASE = "https://api.webflow.com/v2"
 
 
+_WEBFLOW_TOKEN = (os.getenv("WEBFLOW_ACCESS_TOKEN") or "").strip()
+_WEBFLOW_HEADERS = MappingProxyType({
+    "Authorization": f"Bearer {_WEBFLOW_TOKEN}",
+    "Accept": "application/json",
+})
+
+
 def _webflow_headers() -> dict:
-    token = (os.getenv("WEBFLOW_ACCESS_TOKEN") or "").strip()
-    if not token:
+    """Copy of the Webflow auth headers, resolved once at import; callers may add to it."""
+    if not _WEBFLOW_TOKEN:
         raise ValueError("WEBFLOW_ACCESS_TOKEN is not set.")
-    return {
-        "Authorization": f"Bearer {token}",
-        "Accept": "application/json",
-    }
+    return dict(_WEBFLOW_HEADERS)
 
 
 @mcp.tool
-def get_webflow_page(page_id: str) -> dict:
+async def get_webflow_page(page_id: str) -> dict:
     """
     Fetches a single Webflow page by ID. Returns id, title, seo, openGraph, publishedPath.
 
@@ -1091,13 +1831,13 @@ def get_webflow_page(page_id: str) -> dict:
     """
     try:
         headers = _webflow_headers()
-        r = requests.get(
+        r = await _backend_http.get(
             f"{WEBFLOW_API_BASE}/pages/{page_id}",
             headers=headers,
             timeout=30,
         )
         r.raise_for_status()
-        data = r.json()
+        data = orjson.loads(r.content)
         return {
             "id": data.get("id"),
             "title": data.get("title"),
@@ -1105,14 +1845,14 @@ def get_webflow_page(page_id: str) -> dict:
             "openGraph": data.get("openGraph"),
             "publishedPath": data.get("publishedPath"),
         }
-    except requests.RequestException as e:
+    except httpx.HTTPError as e:
         return {"error": str(e), "id": None, "title": None, "seo": None, "openGraph": None, "publishedPath": None}
     except ValueError as e:
         return {"error": str(e), "id": None, "title": None, "seo": None, "openGraph": None, "publishedPath": None}
 
 
 @mcp.tool
-def update_webflow_page(
+async def update_webflow_page(
     page_id: str,
     seo: Optional[dict] = None,
     open_graph: Optional[dict] = None,
@@ -1141,14 +1881,14 @@ def update_webflow_page(
             body["openGraph"] = open_graph
         if not body:
             return {"error": "Provide at least one of seo or open_graph."}
-        r = requests.put(
+        r = await _backend_http.put(
             f"{WEBFLOW_API_BASE}/pages/{page_id}",
             headers=headers,
-            json=body,
+            content=orjson.dumps(body),
             timeout=30,
         )
         r.raise_for_status()
-        data = r.json()
+        data = orjson.loads(r.content)
         return {
             "id": data.get("id"),
             "title": data.get("title"),
@@ -1156,14 +1896,14 @@ def update_webflow_page(
             "openGraph": data.get("openGraph"),
             "publishedPath": data.get("publishedPath"),
         }
-    except requests.RequestException as e:
+    except httpx.HTTPError as e:
         return {"error": str(e)}
     except ValueError as e:
         return {"error": str(e)}
 
 
 @mcp.tool
-def publish_webflow_site(site_id: str) -> dict:
+async def publish_webflow_site(site_id: str) -> dict:
     """
     Publishes the Webflow site (pushes draft changes live). Use after updating pages.
     Requires WEBFLOW_ACCESS_TOKEN.
@@ -1176,47 +1916,123 @@ def publish_webflow_site(site_id: str) -> dict:
     """
     try:
         headers = _webflow_headers()
-        r = requests.post(
+        r = await _backend_http.post(
             f"{WEBFLOW_API_BASE}/sites/{site_id}/publish",
             headers=headers,
             timeout=60,
         )
         r.raise_for_status()
-        return r.json() if r.text else {"status": "ok"}
-    except requests.RequestException as e:
+        return orjson.loads(r.content) if r.content else {"status": "ok"}
+    except httpx.HTTPError as e:
         return {"error": str(e)}
     except ValueError as e:
         return {"error": str(e)}
 
 
-@mcp.tool
-def generate_image(prompt: str, filename: str = "generated_image.png") -> dict:
-    """
-    Generates an image using Google Gemini's image generation API, decodes base64 if needed,
-    and uploads it to AWS S3 for hosting.
-    
-    Args:
-        prompt (str): The text prompt describing the image to generate.
-        filename (str): The filename to use when saving the image (default: "generated_image.png").
-    
-    Returns:
-        dict: A dictionary containing the hosted image URL and other metadata.
-    """
-    if not _google_api_key:
-        raise ValueError("GOOGLE_API_KEY environment variable is not set.")
-    
-    if not _s3_client:
-        raise ValueError("AWS credentials not configured. Set AWS_ACCESS_KEY_ID, AWS_SECRET_ACCESS_KEY, and AWS_S3_BUCKET.")
-    
-    if not _aws_s3_bucket:
-        raise ValueError("AWS_S3_BUCKET environment variable is not set.")
+# Fallback content types for generate_image when Gemini omits mimeType
+_EXT_TO_MIME = {".jpg": "image/jpeg", ".jpeg": "image/jpeg", ".gif": "image/gif", ".webp": "image/webp"}
+
+
+def _upload_image(s3_client, image_bytes: bytes, key: str, content_type: str) -> None:
+    """Upload image_bytes to key in the images bucket (blocking; run via asyncio.to_thread)."""
+    from boto3.s3.transfer import TransferConfig
+    s3_client.upload_fileobj(
+        # BytesIO wraps the decoded bytes without copying them
+        io.BytesIO(image_bytes),
+        _aws_s3_bucket,
+        key,
+        ExtraArgs={"ContentType": content_type},
+        # Parts upload in parallel above the multipart threshold
+        Config=TransferConfig(multipart_threshold=S3_MULTIPART_THRESHOLD, use_threads=True),
+        # Note: ACLs are disabled on this bucket. Make bucket public via bucket policy instead.
+    )
+
+
+def _warm_s3_connection(s3_client) -> None:
+    """Open the S3 connection (TLS + DNS) ahead of the upload; failures surface on the upload instead."""
+    try:
+        s3_client.head_bucket(Bucket=_aws_s3_bucket)
+    except Exception as e:
+        logger.info("S3 warmup failed: %s", e)
+
+
+# Gemini statuses worth retrying; any other 4xx (bad prompt, auth) fails immediately
+_GEMINI_RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+# Cap on in-flight Gemini requests across all callers, to stay within its rate limits
+_GEMINI_MAX_CONCURRENCY = 8
+_gemini_sem = asyncio.Semaphore(_GEMINI_MAX_CONCURRENCY)
+
+
+def _gemini_retry_delay(attempt: int, response: Optional[httpx.Response] = None) -> float:
+    """Retry-After when Gemini sends one, else 1s/2s/4s backoff, plus up to 25% jitter."""
+    delay = 1.0 * (2 ** attempt)
+    if response is not None:
+        retry_after = response.headers.get("Retry-After")
+        if retry_after:
+            try:
+                delay = min(float(retry_after), 60.0)
+            except ValueError:
+                pass  # HTTP-date form; keep the backoff delay
+    return delay + random.uniform(0, 0.25 * delay)
+
+
+async def _post_gemini(payload: dict) -> dict:
+    """POST to Gemini, retrying transport errors and 429/5xx up to 3 attempts in total."""
+    max_retries = 3
+    # Serialize once; every retry sends the same bytes
+    body = orjson.dumps(payload)
     
-    # Call Google Gemini API with exponential backoff retry logic
-    headers = {
-        "x-goog-api-key": _google_api_key,
-        "Content-Type": "application/json"
-    }
+    for attempt in range(max_retries):
+        try:
+            async with _gemini_sem:
+                response = await _gemini_http.post(_google_api_url, content=body)
+            response.raise_for_status()
+            # orjson parses the multi-MB base64 body far faster than stdlib json
+            return orjson.loads(response.content)
+            
+        except httpx.HTTPStatusError as e:
+            if e.response.status_code not in _GEMINI_RETRY_STATUSES:
+                raise Exception(f"Google Gemini API request failed: {str(e)}")
+            if attempt == max_retries - 1:
+                raise Exception(f"Google Gemini API request failed after {max_retries} attempts: {str(e)}")
+            await asyncio.sleep(_gemini_retry_delay(attempt, e.response))
+        except httpx.HTTPError as e:
+            if attempt == max_retries - 1:
+                raise Exception(f"Google Gemini API request failed after {max_retries} attempts: {str(e)}")
+            await asyncio.sleep(_gemini_retry_delay(attempt))
+
+
+def _redact_inline_data(value):
+    """Copy of a Gemini response with inlineData.data (base64 image bytes) replaced by a size note."""
+    if isinstance(value, dict):
+        redacted = {k: _redact_inline_data(v) for k, v in value.items()}
+        inline_data = redacted.get("inlineData")
+        if isinstance(inline_data, dict) and isinstance(inline_data.get("data"), str):
+            inline_data["data"] = f"<{len(value['inlineData']['data'])} base64 chars redacted>"
+        return redacted
+    if isinstance(value, list):
+        return [_redact_inline_data(v) for v in value]
+    return value
+
+
+def _redacted_json(value) -> str:
+    """JSON for error messages, without the multi-MB inline image payload."""
+    return orjson.dumps(_redact_inline_data(value), option=orjson.OPT_INDENT_2).decode()
+
+
+async def _generate_image(prompt: str, filename: str) -> dict:
+    """Generate an image with Gemini and upload it to S3 (see generate_image)."""
+    if not _google_api_key:
+        raise ValueError("GOOGLE_API_KEY environment variable is not set.")
     
+    s3_client = _get_s3_client()
+    if not s3_client:
+        raise ValueError("AWS credentials not configured. Set AWS_ACCESS_KEY_ID, AWS_SECRET_ACCESS_KEY, and AWS_S3_BUCKET.")
+    
+    if not _aws_s3_bucket:
+        raise ValueError("AWS_S3_BUCKET environment variable is not set.")
+    
+    # Call Google Gemini API with exponential backoff retry logic
     payload = {
         "contents": [
             {
@@ -1229,45 +2045,22 @@ def generate_image(prompt: str, filename: str = "generated_image.png") -> dict:
         ]
     }
     
-    # Exponential backoff: 3 retries with delays of 1s, 2s, 4s
-    max_retries = 3
-    base_delay = 1.0  # Start with 1 second
-    
-    result = None
-    last_exception = None
-    
-    for attempt in range(max_retries):
-        try:
-            response = requests.post(_google_api_url, headers=headers, json=payload, timeout=60)
-            response.raise_for_status()
-            result = response.json()
-            break  # Success, exit retry loop
-            
-        except requests.exceptions.RequestException as e:
-            last_exception = e
-            if attempt < max_retries - 1:  # Don't sleep on last attempt
-                delay = base_delay * (2 ** attempt)  # Exponential backoff: 1s, 2s, 4s
-                time.sleep(delay)
-                continue
-            else:
-                # Last attempt failed, raise the exception
-                raise Exception(f"Google Gemini API request failed after {max_retries} attempts: {str(e)}")
-    
-    if result is None:
-        raise Exception(f"Google Gemini API request failed after {max_retries} attempts: {str(last_exception)}")
+    # Warm the S3 connection in a worker thread while Gemini generates the image
+    result, _ = await asyncio.gather(
+        _post_gemini(payload),
+        asyncio.to_thread(_warm_s3_connection, s3_client),
+    )
     
     # Extract image data from response
     # According to docs: response.candidates[0].content.parts - iterate through parts to find inlineData
     # Parts can contain both text and inlineData, so we need to find the image part
     try:
         if 'candidates' not in result or not result['candidates']:
-            import json
-            raise Exception(f"No candidates in Google Gemini API response. Full response: {json.dumps(result, indent=2)}")
+            raise Exception(f"No candidates in Google Gemini API response. Full response: {_redacted_json(result)}")
         
         candidate = result['candidates'][0]
         if 'content' not in candidate or 'parts' not in candidate['content']:
-            import json
-            raise Exception(f"No content/parts in Google Gemini API response. Candidate: {json.dumps(candidate, indent=2)}")
+            raise Exception(f"No content/parts in Google Gemini API response. Candidate: {_redacted_json(candidate)}")
         
         parts = candidate['content']['parts']
         if not parts:
@@ -1286,44 +2079,26 @@ def generate_image(prompt: str, filename: str = "generated_image.png") -> dict:
                 break
         
         if not image_base64:
-            import json
             # Log what parts we actually got for debugging
-            part_types = [list(p.keys()) for p in parts]
-            raise Exception(f"No inlineData found in any part. Part types found: {part_types}. Full response: {json.dumps(result, indent=2)}")
+            part_types = [list(p) for p in parts]
+            raise Exception(f"No inlineData found in any part. Part types found: {part_types}. Full response: {_redacted_json(result)}")
         
-        # Decode base64 image
-        image_bytes = base64.b64decode(image_base64)
+        # Decode base64 image (binascii skips b64decode's wrapper and validation pass)
+        image_bytes = binascii.a2b_base64(image_base64)
         
-    except (KeyError, IndexError, TypeError) as e:
-        import json
-        raise Exception(f"Unexpected response structure from Google Gemini API: {e}. Response: {json.dumps(result, indent=2)}")
+    except (KeyError, IndexError, TypeError, binascii.Error) as e:
+        raise Exception(f"Unexpected response structure from Google Gemini API: {e}. Response: {_redacted_json(result)}")
     
     # Use mime_type from API response, or fallback to filename extension
-    content_type = mime_type
-    if not content_type:
-        # Fallback to determining from filename
-        if filename.lower().endswith('.jpg') or filename.lower().endswith('.jpeg'):
-            content_type = "image/jpeg"
-        elif filename.lower().endswith('.gif'):
-            content_type = "image/gif"
-        elif filename.lower().endswith('.webp'):
-            content_type = "image/webp"
-        else:
-            content_type = "image/png"
+    content_type = mime_type or _EXT_TO_MIME.get(os.path.splitext(filename)[1].lower(), "image/png")
     
     # Upload to S3
     try:
-        _s3_client.put_object(
-            Bucket=_aws_s3_bucket,
-            Key=filename,
-            Body=image_bytes,
-            ContentType=content_type
-            # Note: ACLs are disabled on this bucket. Make bucket public via bucket policy instead.
-        )
+        await asyncio.to_thread(_upload_image, s3_client, image_bytes, filename, content_type)
         
         # Construct the public URL
-        # Format: https://bucket-name.s3.region.amazonaws.com/filename
-        hosted_url = f"https://{_aws_s3_bucket}.s3.{_aws_region}.amazonaws.com/{filename}"
+        # Percent-encode the key so spaces and non-ASCII filenames give a valid URL
+        hosted_url = _S3_URL_PREFIX + quote(filename)
         
         return {
             "url": hosted_url,
@@ -1338,604 +2113,520 @@ def generate_image(prompt: str, filename: str = "generated_image.png") -> dict:
         raise Exception(f"Failed to upload image to S3: {str(e)}")
 
 
+# Identical concurrent (prompt, filename) requests share one Gemini call and upload
+_generate_image_inflight: dict[tuple[str, str], asyncio.Task] = {}
+
+
+async def _generate_image_shared(prompt: str, filename: str) -> dict:
+    """_generate_image, joining an identical in-flight call instead of starting a second one."""
+    key = (prompt, filename)
+    task = _generate_image_inflight.get(key)
+    if task is None:
+        task = _generate_image_inflight[key] = asyncio.create_task(_generate_image(prompt, filename))
+        task.add_done_callback(lambda _: _generate_image_inflight.pop(key, None))
+    # Shield so one caller cancelling doesn't cancel the work the others are waiting on
+    return await asyncio.shield(task)
+
+
 @mcp.tool
-def update_discovery_document(
-    client_id: int,
+async def generate_image(prompt: str, filename: str = "generated_image.png") -> dict:
+    """
+    Generates an image using Google Gemini's image generation API, decodes base64 if needed,
+    and uploads it to AWS S3 for hosting.
+    
+    Args:
+        prompt (str): The text prompt describing the image to generate.
+        filename (str): The filename to use when saving the image (default: "generated_image.png").
+    
+    Returns:
+        dict: A dictionary containing the hosted image URL and other metadata.
+    """
+    return await _generate_image_shared(prompt, filename)
+
+
+# Upper bound on images per generate_images call
+MAX_GENERATE_IMAGES = 20
+
+
+class ImageRequest(BaseModel):
+    """One image in generate_images."""
+    model_config = ConfigDict(extra="forbid")
+
+    prompt: str = Field(description="The text prompt describing the image to generate.")
+    filename: str = Field(description="The filename to save the image as; must be unique within the batch.")
+
+
+@mcp.tool
+async def generate_images(images: list[ImageRequest]) -> dict:
+    """
+    Generates several images concurrently with Google Gemini and uploads each to AWS S3.
+    Use this instead of repeated generate_image calls when a post needs more than one image.
+    
+    Args:
+        images (list[ImageRequest]): One entry per image, each with prompt and filename (max 20).
+    
+    Returns:
+        dict: 'items' aligned with the input; each is the generate_image result, or
+              prompt, filename and error when that image failed.
+    """
+    if not images:
+        raise ValueError("At least one image is required.")
+    if len(images) > MAX_GENERATE_IMAGES:
+        raise ValueError(f"Maximum {MAX_GENERATE_IMAGES} images allowed per request.")
+    filenames = [image.filename for image in images]
+    if len(set(filenames)) != len(filenames):
+        raise ValueError("Each filename may appear only once per batch.")
+    
+    # Gemini calls run concurrently, bounded by _gemini_sem
+    results = await asyncio.gather(
+        *(_generate_image_shared(image.prompt, image.filename) for image in images),
+        return_exceptions=True,
+    )
+    items = []
+    for image, result in zip(images, results):
+        if isinstance(result, BaseException):
+            if not isinstance(result, Exception):
+                raise result
+            items.append({"prompt": image.prompt, "filename": image.filename, "error": str(result)})
+        else:
+            items.append(result)
+    return {"items": items}
+
+
+class DiscoveryFields(BaseModel):
+    """
+    Discovery document fields, one per discovery_documents column. All are optional; only
+    provide fields you have researched and are confident about. Fields marked JSON take a
+    JSON string (array or object) and are parsed before storage.
+    """
+    model_config = ConfigDict(extra="forbid")
+
     # Domain
-    domain: Optional[str] = None,
+    domain: Optional[str] = Field(None, description="The client's domain name (e.g., \"acme.com\").")
     # Section 0: Meta/Header
-    client_name: Optional[str] = None,
-    discovery_date: Optional[str] = None,
-    contact_name: Optional[str] = None,
-    contact_title: Optional[str] = None,
-    contact_email: Optional[str] = None,
-    contact_phone: Optional[str] = None,
-    industry: Optional[str] = None,
+    client_name: Optional[str] = Field(None, description="Company/client name.")
+    discovery_date: Optional[str] = Field(None, description="Date of discovery in YYYY-MM-DD format.")
+    contact_name: Optional[str] = Field(None, description="Primary contact person's name.")
+    contact_title: Optional[str] = Field(None, description="Primary contact's job title.")
+    contact_email: Optional[str] = Field(None, description="Primary contact's email.")
+    contact_phone: Optional[str] = Field(None, description="Primary contact's phone number.")
+    industry: Optional[str] = Field(None, description="The industry the company operates in.")
     # Section 1: Company Overview & Business Objectives
-    primary_business: Optional[str] = None,
-    years_in_business: Optional[str] = None,
-    annual_revenue: Optional[str] = None,
-    num_employees: Optional[int] = None,
-    geographic_market: Optional[str] = None,
-    primary_goal_12_months: Optional[str] = None,
-    target_leads_per_month: Optional[int] = None,
-    target_leads_timeframe: Optional[str] = None,
-    target_cpl_amount: Optional[str] = None,
-    target_cpl_reasoning: Optional[str] = None,
-    qualified_lead_definition: Optional[str] = None,
-    customer_ltv: Optional[str] = None,
-    customer_ltv_calculation: Optional[str] = None,
-    sales_cycle_length: Optional[str] = None,
-    close_rate_percent: Optional[str] = None,
-    close_rate_not_tracked: Optional[bool] = None,
-    current_monthly_leads: Optional[int] = None,
-    current_lead_generation_method: Optional[str] = None,
-    current_sql_percent: Optional[str] = None,
-    previous_marketing_efforts: Optional[str] = None,  # JSON string
-    what_is_working: Optional[str] = None,
-    budget_monthly: Optional[str] = None,
-    budget_quarterly: Optional[str] = None,
-    budget_annual: Optional[str] = None,
-    leadgen_budget_monthly: Optional[str] = None,
-    leadgen_budget_quarterly: Optional[str] = None,
-    leadgen_budget_annual: Optional[str] = None,
-    seasonal_peak_months: Optional[str] = None,
-    seasonal_slow_months: Optional[str] = None,
-    seasonal_details: Optional[str] = None,
+    primary_business: Optional[str] = Field(None, description="Company's primary business/service offering description.")
+    years_in_business: Optional[str] = Field(None, description="How long the company has been in business.")
+    annual_revenue: Optional[str] = Field(None, description="Current annual revenue or revenue range (e.g., \"$1-3M\").")
+    num_employees: Optional[int] = Field(None, description="Number of employees.")
+    geographic_market: Optional[str] = Field(None, description="Geographic service area/market.")
+    primary_goal_12_months: Optional[str] = Field(None, description="Primary business goal for the next 12 months.")
+    target_leads_per_month: Optional[int] = Field(None, description="Target number of leads per month.")
+    target_leads_timeframe: Optional[str] = Field(None, description="Timeframe for achieving target leads.")
+    target_cpl_amount: Optional[str] = Field(None, description="Target cost per lead amount.")
+    target_cpl_reasoning: Optional[str] = Field(None, description="How the target CPL was determined.")
+    qualified_lead_definition: Optional[str] = Field(None, description="What defines a \"qualified lead\" for this business.")
+    customer_ltv: Optional[str] = Field(None, description="Estimated customer lifetime value.")
+    customer_ltv_calculation: Optional[str] = Field(None, description="How LTV is calculated.")
+    sales_cycle_length: Optional[str] = Field(None, description="Typical sales cycle length (e.g., \"6-8 weeks\").")
+    close_rate_percent: Optional[str] = Field(None, description="Percentage of leads that close.")
+    close_rate_not_tracked: Optional[bool] = Field(None, description="Whether close rate is currently tracked.")
+    current_monthly_leads: Optional[int] = Field(None, description="Current number of monthly leads.")
+    current_lead_generation_method: Optional[str] = Field(None, description="How leads are currently generated.")
+    current_sql_percent: Optional[str] = Field(None, description="Percentage of leads that are sales-qualified.")
+    previous_marketing_efforts: Optional[str] = Field(None, description="JSON array of previous marketing efforts with fields: channel_name, timeframe, result, why_worked.")
+    what_is_working: Optional[str] = Field(None, description="What is currently working in their marketing.")
+    budget_monthly: Optional[str] = Field(None, description="Total monthly marketing budget.")
+    budget_quarterly: Optional[str] = Field(None, description="Total quarterly marketing budget.")
+    budget_annual: Optional[str] = Field(None, description="Total annual marketing budget.")
+    leadgen_budget_monthly: Optional[str] = Field(None, description="Monthly budget allocated to lead generation.")
+    leadgen_budget_quarterly: Optional[str] = Field(None, description="Quarterly budget for lead generation.")
+    leadgen_budget_annual: Optional[str] = Field(None, description="Annual budget for lead generation.")
+    seasonal_peak_months: Optional[str] = Field(None, description="Peak business months.")
+    seasonal_slow_months: Optional[str] = Field(None, description="Slow business months.")
+    seasonal_details: Optional[str] = Field(None, description="Details about seasonality.")
     # Section 2: Target Audience
-    ideal_customer_description: Optional[str] = None,
-    decision_maker_titles: Optional[str] = None,
-    decision_authority_level: Optional[str] = None,
-    target_company_size: Optional[str] = None,
-    target_industries: Optional[str] = None,
-    geographic_focus: Optional[str] = None,
-    customer_age_range: Optional[str] = None,
-    customer_gender: Optional[str] = None,
-    customer_education: Optional[str] = None,
-    customer_income_range: Optional[str] = None,
-    pain_point_1: Optional[str] = None,
-    pain_point_2: Optional[str] = None,
-    pain_point_3: Optional[str] = None,
-    goal_motivation_1: Optional[str] = None,
-    goal_motivation_2: Optional[str] = None,
-    goal_motivation_3: Optional[str] = None,
-    buying_process: Optional[str] = None,
-    secondary_audiences: Optional[str] = None,  # JSON string
+    ideal_customer_description: Optional[str] = Field(None, description="Description of the ideal customer.")
+    decision_maker_titles: Optional[str] = Field(None, description="Job titles of decision makers.")
+    decision_authority_level: Optional[str] = Field(None, description="Decision authority level (C-Suite, Director, Manager, Other).")
+    target_company_size: Optional[str] = Field(None, description="Target company size (employees or revenue range).")
+    target_industries: Optional[str] = Field(None, description="List of target industries.")
+    geographic_focus: Optional[str] = Field(None, description="Geographic focus for customers.")
+    customer_age_range: Optional[str] = Field(None, description="Target customer age range.")
+    customer_gender: Optional[str] = Field(None, description="Target gender (All, Specific).")
+    customer_education: Optional[str] = Field(None, description="Education level (High school, Bachelor's, Advanced, Any).")
+    customer_income_range: Optional[str] = Field(None, description="Income/budget authority range.")
+    pain_point_1: Optional[str] = Field(None, description="Main customer pain point #1.")
+    pain_point_2: Optional[str] = Field(None, description="Main customer pain point #2.")
+    pain_point_3: Optional[str] = Field(None, description="Main customer pain point #3.")
+    goal_motivation_1: Optional[str] = Field(None, description="Customer goal/motivation #1.")
+    goal_motivation_2: Optional[str] = Field(None, description="Customer goal/motivation #2.")
+    goal_motivation_3: Optional[str] = Field(None, description="Customer goal/motivation #3.")
+    buying_process: Optional[str] = Field(None, description="Typical buying process description.")
+    secondary_audiences: Optional[str] = Field(None, description="JSON array of secondary audiences with fields: description, job_titles, why_target.")
     # Section 3: Value Proposition & Messaging
-    differentiation: Optional[str] = None,
-    value_prop_1: Optional[str] = None,
-    value_prop_2: Optional[str] = None,
-    value_prop_3: Optional[str] = None,
-    why_choose_us: Optional[str] = None,
-    market_perception: Optional[str] = None,
-    brand_voice_tones: Optional[str] = None,  # JSON array string
-    brand_voice_other: Optional[str] = None,
-    messaging_theme_1: Optional[str] = None,
-    messaging_theme_2: Optional[str] = None,
-    messaging_theme_3: Optional[str] = None,
-    testimonials_available: Optional[str] = None,
-    testimonials_count: Optional[int] = None,
-    testimonials_examples: Optional[str] = None,
-    proof_customer_stories: Optional[str] = None,
-    proof_statistics: Optional[str] = None,
-    proof_awards: Optional[str] = None,
-    proof_notable_customers: Optional[str] = None,
+    differentiation: Optional[str] = Field(None, description="What makes the business different from competitors.")
+    value_prop_1: Optional[str] = Field(None, description="Top value proposition #1.")
+    value_prop_2: Optional[str] = Field(None, description="Top value proposition #2.")
+    value_prop_3: Optional[str] = Field(None, description="Top value proposition #3.")
+    why_choose_us: Optional[str] = Field(None, description="Why prospects should choose them over competitors.")
+    market_perception: Optional[str] = Field(None, description="How they want to be perceived in the market.")
+    brand_voice_tones: Optional[str] = Field(None, description="JSON array of brand voice/tone selections from: \"Professional / Corporate\", \"Casual / Conversational\", \"Educational / Thought Leadership\", \"Results-Driven / ROI-Focused\", \"Innovative / Forward-Thinking\", \"Supportive / Customer-Centric\".")
+    brand_voice_other: Optional[str] = Field(None, description="Other brand voice description if applicable.")
+    messaging_theme_1: Optional[str] = Field(None, description="Key messaging theme #1.")
+    messaging_theme_2: Optional[str] = Field(None, description="Key messaging theme #2.")
+    messaging_theme_3: Optional[str] = Field(None, description="Key messaging theme #3.")
+    testimonials_available: Optional[str] = Field(None, description="Whether testimonials are available (Yes, Some, No).")
+    testimonials_count: Optional[int] = Field(None, description="Number of testimonials/case studies available.")
+    testimonials_examples: Optional[str] = Field(None, description="Examples or descriptions of testimonials.")
+    proof_customer_stories: Optional[str] = Field(None, description="Customer success stories.")
+    proof_statistics: Optional[str] = Field(None, description="Relevant statistics/metrics.")
+    proof_awards: Optional[str] = Field(None, description="Awards/certifications.")
+    proof_notable_customers: Optional[str] = Field(None, description="Notable customers.")
     # Section 4: Competitive Landscape
-    competitor_1: Optional[str] = None,
-    competitor_2: Optional[str] = None,
-    competitor_3: Optional[str] = None,
-    competitor_channels: Optional[str] = None,  # JSON string
-    competitor_strengths: Optional[str] = None,
-    competitive_advantages: Optional[str] = None,
+    competitor_1: Optional[str] = Field(None, description="Main competitor #1 name.")
+    competitor_2: Optional[str] = Field(None, description="Main competitor #2 name.")
+    competitor_3: Optional[str] = Field(None, description="Main competitor #3 name.")
+    competitor_channels: Optional[str] = Field(None, description="JSON array of competitor channel info with fields: name, google_ads, meta_ads, social_media, seo_content, website_quality, other_channels.")
+    competitor_strengths: Optional[str] = Field(None, description="What competitors are doing well.")
+    competitive_advantages: Optional[str] = Field(None, description="Where they have competitive advantages.")
     # Section 5: SetSail Services Assessment
-    services_interested: Optional[str] = None,  # JSON array string
-    services_interest_reasons: Optional[str] = None,  # JSON object string
-    google_ads_used: Optional[bool] = None,
-    google_ads_experience: Optional[str] = None,
-    meta_ads_used: Optional[bool] = None,
-    meta_ads_experience: Optional[str] = None,
-    social_media_used: Optional[bool] = None,
-    social_media_experience: Optional[str] = None,
-    seo_used: Optional[bool] = None,
-    seo_experience: Optional[str] = None,
-    website_dev_used: Optional[bool] = None,
-    website_dev_experience: Optional[str] = None,
-    services_not_wanted: Optional[bool] = None,
-    services_not_wanted_details: Optional[str] = None,
+    services_interested: Optional[str] = Field(None, description="JSON array of services interested in: \"google_ads\", \"meta_ads\", \"social_media\", \"seo\", \"website_dev\".")
+    services_interest_reasons: Optional[str] = Field(None, description="JSON object mapping service to reason for interest.")
+    google_ads_used: Optional[bool] = Field(None, description="Whether Google Ads has been used before.")
+    google_ads_experience: Optional[str] = Field(None, description="Google Ads experience level (Beginner, Intermediate, Advanced, N/A).")
+    meta_ads_used: Optional[bool] = Field(None, description="Whether Meta Ads has been used before.")
+    meta_ads_experience: Optional[str] = Field(None, description="Meta Ads experience level.")
+    social_media_used: Optional[bool] = Field(None, description="Whether social media marketing has been used.")
+    social_media_experience: Optional[str] = Field(None, description="Social media experience level.")
+    seo_used: Optional[bool] = Field(None, description="Whether SEO has been used before.")
+    seo_experience: Optional[str] = Field(None, description="SEO experience level.")
+    website_dev_used: Optional[bool] = Field(None, description="Whether website development services were used.")
+    website_dev_experience: Optional[str] = Field(None, description="Website development experience level.")
+    services_not_wanted: Optional[bool] = Field(None, description="Whether there are services they specifically don't want.")
+    services_not_wanted_details: Optional[str] = Field(None, description="Details on services not wanted and why.")
     # Section 6: Current Digital Presence
-    has_website: Optional[bool] = None,
-    website_url: Optional[str] = None,
-    website_status: Optional[str] = None,  # JSON array string
-    website_status_other: Optional[str] = None,
-    website_monthly_visitors: Optional[int] = None,
-    website_conversion_rate: Optional[str] = None,
-    website_main_issues: Optional[str] = None,
-    social_platforms: Optional[str] = None,  # JSON string
-    social_strategy: Optional[str] = None,
+    has_website: Optional[bool] = Field(None, description="Whether they currently have a website.")
+    website_url: Optional[str] = Field(None, description="Website URL.")
+    website_status: Optional[str] = Field(None, description="JSON array of website status selections: \"Recently built\", \"Needs updating / redesign\", \"Being built\".")
+    website_status_other: Optional[str] = Field(None, description="Other website status description.")
+    website_monthly_visitors: Optional[int] = Field(None, description="Monthly website visitors.")
+    website_conversion_rate: Optional[str] = Field(None, description="Website conversion rate.")
+    website_main_issues: Optional[str] = Field(None, description="Main website issues.")
+    social_platforms: Optional[str] = Field(None, description="JSON array of social platforms with fields: platform, followers, activity_level, primary_goal.")
+    social_strategy: Optional[str] = Field(None, description="Current social media strategy description.")
     # Section 7: Analytics & Tracking
-    analytics_tools: Optional[str] = None,  # JSON array string
-    analytics_other: Optional[str] = None,
-    crm_name: Optional[str] = None,
-    crm_features_used: Optional[str] = None,
-    lead_data_tracked: Optional[str] = None,
-    conversion_tracking_status: Optional[str] = None,
-    conversion_tracking_details: Optional[str] = None,
-    crm_integration_possible: Optional[str] = None,
-    crm_integration_details: Optional[str] = None,
+    analytics_tools: Optional[str] = Field(None, description="JSON array of analytics tools used: \"Google Analytics 4\", \"Google Analytics (Universal Analytics)\", \"None currently\".")
+    analytics_other: Optional[str] = Field(None, description="Other analytics tools.")
+    crm_name: Optional[str] = Field(None, description="CRM/lead management system name.")
+    crm_features_used: Optional[str] = Field(None, description="CRM features being used.")
+    lead_data_tracked: Optional[str] = Field(None, description="What lead data is tracked.")
+    conversion_tracking_status: Optional[str] = Field(None, description="Conversion tracking status (Yes – Fully set up, Partially set up, No – Needs to be set up).")
+    conversion_tracking_details: Optional[str] = Field(None, description="Details on conversion tracking setup.")
+    crm_integration_possible: Optional[str] = Field(None, description="Whether CRM integration is possible (Yes – CRM supports integrations, Unsure, No – Manual lead entry only).")
+    crm_integration_details: Optional[str] = Field(None, description="Details on CRM integration possibilities.")
     # Section 8: Current Tech Stack
-    tools_used: Optional[str] = None,  # JSON array string
-    tools_other: Optional[str] = None,
+    tools_used: Optional[str] = Field(None, description="JSON array of tools used: \"Google Workspace (Gmail, Docs, Sheets)\", \"Microsoft 365\", \"Slack\", \"Monday.com\", \"Asana\", \"Salesforce\", \"HubSpot\", \"Zapier\".")
+    tools_other: Optional[str] = Field(None, description="Other tools used.")
     # Section 9: Team & Support
-    poc_name: Optional[str] = None,
-    poc_title: Optional[str] = None,
-    poc_email: Optional[str] = None,
-    poc_phone: Optional[str] = None,
-    poc_availability: Optional[str] = None,
-    other_stakeholders: Optional[str] = None,  # JSON string
-    final_decision_name: Optional[str] = None,
-    final_decision_title: Optional[str] = None,
-    decision_timeline: Optional[str] = None,
-    resources_available: Optional[str] = None,  # JSON array string
-    resources_other: Optional[str] = None,
-    has_dev_support: Optional[bool] = None,
-    has_marketing_support: Optional[bool] = None,
-    has_sales_support: Optional[bool] = None,
-    internal_resources_other: Optional[str] = None,
+    poc_name: Optional[str] = Field(None, description="Primary point of contact name.")
+    poc_title: Optional[str] = Field(None, description="Primary point of contact title.")
+    poc_email: Optional[str] = Field(None, description="Primary point of contact email.")
+    poc_phone: Optional[str] = Field(None, description="Primary point of contact phone.")
+    poc_availability: Optional[str] = Field(None, description="POC availability (days/hours).")
+    other_stakeholders: Optional[str] = Field(None, description="JSON array of other stakeholders with fields: name, title, role, email.")
+    final_decision_name: Optional[str] = Field(None, description="Name of final decision authority.")
+    final_decision_title: Optional[str] = Field(None, description="Title of final decision authority.")
+    decision_timeline: Optional[str] = Field(None, description="Typical decision timeline.")
+    resources_available: Optional[str] = Field(None, description="JSON array of available resources: \"Brand guidelines / style guide\", \"Product / service information documents\", etc.")
+    resources_other: Optional[str] = Field(None, description="Other resources available.")
+    has_dev_support: Optional[bool] = Field(None, description="Whether developer/IT support is available.")
+    has_marketing_support: Optional[bool] = Field(None, description="Whether marketing support is available.")
+    has_sales_support: Optional[bool] = Field(None, description="Whether sales support is available.")
+    internal_resources_other: Optional[str] = Field(None, description="Other internal resources.")
     # Section 10: Timeline & Expectations
-    target_launch_date: Optional[str] = None,
-    urgency_level: Optional[str] = None,
-    first_leads_timeframe: Optional[str] = None,
-    ramp_up_timeframe: Optional[str] = None,
-    full_results_timeframe: Optional[str] = None,
-    success_indicator_1: Optional[str] = None,
-    success_indicator_2: Optional[str] = None,
-    success_indicator_3: Optional[str] = None,
-    exceed_expectations: Optional[str] = None,
-    concern_1: Optional[str] = None,
-    concern_2: Optional[str] = None,
-    concern_3: Optional[str] = None,
+    target_launch_date: Optional[str] = Field(None, description="Target strategy launch date (YYYY-MM-DD).")
+    urgency_level: Optional[str] = Field(None, description="How urgent (Very flexible, Moderate, Fast, Urgent).")
+    first_leads_timeframe: Optional[str] = Field(None, description="Timeframe for first leads.")
+    ramp_up_timeframe: Optional[str] = Field(None, description="Timeframe for performance ramp-up.")
+    full_results_timeframe: Optional[str] = Field(None, description="Timeframe for full results.")
+    success_indicator_1: Optional[str] = Field(None, description="Success indicator #1 for first 90 days.")
+    success_indicator_2: Optional[str] = Field(None, description="Success indicator #2.")
+    success_indicator_3: Optional[str] = Field(None, description="Success indicator #3.")
+    exceed_expectations: Optional[str] = Field(None, description="What would exceed expectations.")
+    concern_1: Optional[str] = Field(None, description="Biggest concern #1.")
+    concern_2: Optional[str] = Field(None, description="Biggest concern #2.")
+    concern_3: Optional[str] = Field(None, description="Biggest concern #3.")
     # Section 11: Additional Information
-    regulatory_considerations: Optional[str] = None,  # JSON array string
-    regulatory_other: Optional[str] = None,
-    industry_keywords: Optional[str] = None,
-    is_seasonal: Optional[bool] = None,
-    seasonality_peak: Optional[str] = None,
-    seasonality_slow: Optional[str] = None,
-    seasonality_strategy: Optional[str] = None,
-    anything_else: Optional[str] = None,
-    success_definition: Optional[str] = None,
-    case_study_consent: Optional[str] = None,
-) -> dict:
+    regulatory_considerations: Optional[str] = Field(None, description="JSON array of regulatory considerations: \"HIPAA (Healthcare)\", \"GDPR / Privacy regulations\", \"Financial services regulations\", \"Advertising restrictions\", \"None\".")
+    regulatory_other: Optional[str] = Field(None, description="Other regulatory considerations.")
+    industry_keywords: Optional[str] = Field(None, description="Industry-specific keywords/terminology.")
+    is_seasonal: Optional[bool] = Field(None, description="Whether the business is seasonal.")
+    seasonality_peak: Optional[str] = Field(None, description="Peak season months if seasonal.")
+    seasonality_slow: Optional[str] = Field(None, description="Slow season months if seasonal.")
+    seasonality_strategy: Optional[str] = Field(None, description="How seasonality should affect strategy.")
+    anything_else: Optional[str] = Field(None, description="Anything else to know about the business/goals.")
+    success_definition: Optional[str] = Field(None, description="What would make the engagement successful.")
+    case_study_consent: Optional[str] = Field(None, description="Consent to use results as case study (Yes, Maybe – ask later, No).")
+
+
+# Discovery columns stored as JSON; their values arrive as JSON strings and are parsed before storage
+_DISCOVERY_JSON_FIELDS = frozenset({
+    "previous_marketing_efforts",
+    "secondary_audiences",
+    "brand_voice_tones",
+    "competitor_channels",
+    "services_interested",
+    "services_interest_reasons",
+    "website_status",
+    "social_platforms",
+    "analytics_tools",
+    "tools_used",
+    "other_stakeholders",
+    "resources_available",
+    "regulatory_considerations",
+})
+
+
+def _parse_json_field(value: str):
+    """Parse a JSON string field, wrapping non-JSON text in a one-element array since these columns expect arrays."""
+    try:
+        parsed = orjson.loads(value)
+    except orjson.JSONDecodeError:
+        parsed = value  # Use as-is if not valid JSON
+    if isinstance(parsed, str):
+        parsed = [parsed]
+    return parsed
+
+
+# One fixed-shape UPDATE covering every column: untouched columns are passed as NULL and
+# keep their value via COALESCE, so every call reuses the same statement (and plan)
+_DISCOVERY_COLUMNS = tuple(DiscoveryFields.model_fields)
+_DISCOVERY_UPDATE_BASE = (
+    "UPDATE discovery_documents SET "
+    + ", ".join(f"{c} = COALESCE(:{c}, {c})" for c in _DISCOVERY_COLUMNS)
+    + ", updated_at = NOW() WHERE client_id = :client_id"
+)
+# Every UPDATE parameter as NULL; copied per call, then overlaid with the provided fields
+_DISCOVERY_NULL_PARAMS = dict.fromkeys(_DISCOVERY_COLUMNS)
+# Executed as-is for executemany batches; update_discovery_document embeds it in an upsert
+_DISCOVERY_UPDATE_MANY_SQL = text(_DISCOVERY_UPDATE_BASE)
+
+
+# Lightweight Core table (no reflection, so no DB round-trip at import) for discovery INSERTs;
+# SQLAlchemy caches the compiled INSERT per column set
+_discovery_table = table(
+    "discovery_documents",
+    *(column(c) for c in _DISCOVERY_COLUMNS + ("client_id", "edit_token")),
+)
+
+
+# Edit tokens are drawn from one batch of entropy: one urandom call per 128 documents
+_EDIT_TOKEN_BATCH = 128
+_edit_tokens = collections.deque()
+_edit_tokens_lock = threading.Lock()
+
+
+def _edit_token() -> str:
+    """URL-safe 32-byte random token, same format as secrets.token_urlsafe(32)."""
+    with _edit_tokens_lock:
+        if not _edit_tokens:
+            raw = secrets.token_bytes(32 * _EDIT_TOKEN_BATCH)
+            _edit_tokens.extend(
+                base64.urlsafe_b64encode(raw[i:i + 32]).rstrip(b"=").decode()
+                for i in range(0, len(raw), 32)
+            )
+        return _edit_tokens.popleft()
+
+
+@functools.lru_cache(maxsize=256)
+def _discovery_upsert_sql(insert_columns: tuple[str, ...]):
     """
-    Updates or creates a discovery document for a client. All fields except client_id are optional.
-    Only provide fields you have researched and are confident about - leave others as None.
+    Update-or-create in one statement for a given set of columns. The INSERT only fires when
+    the UPDATE matched nothing and takes the same parameters, so both paths store identical
+    values. Returns whether a row was created.
+    """
+    columns = ", ".join(insert_columns)
+    values = ", ".join(f":{c}" for c in insert_columns)
+    return text(
+        f"WITH updated AS ({_DISCOVERY_UPDATE_BASE} RETURNING id), "
+        f"inserted AS ("
+        f"INSERT INTO discovery_documents ({columns}) "
+        f"SELECT {values} WHERE NOT EXISTS (SELECT 1 FROM updated) RETURNING id"
+        f") SELECT EXISTS (SELECT 1 FROM inserted)"
+    )
+
+
+def _discovery_update_data(fields: DiscoveryFields) -> dict:
+    """Column -> value for the provided (non-None) fields, with JSON fields parsed and re-serialized."""
+    # Walk only the fields the caller actually set, not all ~150 model fields
+    update_data = {
+        # Sorted so the same fields always give the same column order (and cached statement)
+        k: v for k in sorted(fields.model_fields_set)
+        if (v := getattr(fields, k)) is not None
+    }
+    # None values are already dropped, so every JSON field here has a string to parse
+    for field in _DISCOVERY_JSON_FIELDS.intersection(update_data):
+        update_data[field] = orjson.dumps(_parse_json_field(update_data[field])).decode()
+    return update_data
+
+
+def _update_discovery_document(client_id: int, fields: DiscoveryFields) -> dict:
+    """Upsert one client's discovery fields (blocking; run via asyncio.to_thread)."""
+    try:
+        # Build the update data - only include provided values
+        update_data = _discovery_update_data(fields)
+        
+        if not update_data:
+            return {
+                "status": "no_changes",
+                "client_id": client_id,
+                "message": "No fields provided to update"
+            }
+        field_names = list(update_data)
+        
+        # Update the existing document, or create it (only the provided columns, so the rest
+        # keep their defaults) when there is none, in one round-trip
+        params = _DISCOVERY_NULL_PARAMS.copy()
+        params.update(update_data)
+        params["client_id"] = client_id
+        params["edit_token"] = _edit_token()
+        insert_columns = (*update_data, "client_id", "edit_token")
+        with _session_scope() as db:
+            created = db.execute(_discovery_upsert_sql(insert_columns), params).scalar()
+        action = "created" if created else "updated"
+        
+        return {
+            "status": "success",
+            "action": action,
+            "client_id": client_id,
+            "fields_updated": len(field_names),
+            "field_names": field_names
+        }
+        
+    except Exception as e:
+        raise Exception(f"Failed to update discovery document: {str(e)}")
+
+
+@mcp.tool
+async def update_discovery_document(client_id: int, fields: DiscoveryFields) -> dict:
+    """
+    Updates or creates a discovery document for a client.
+    Only provide fields you have researched and are confident about - omit the others.
     
     This tool allows LLMs to research a company's domain and fill in discovery document fields
     with information gathered from their website, public records, and other sources.
     
     Args:
         client_id (int): Required. The client ID to update the discovery document for.
-        domain (str): The client's domain name (e.g., "acme.com").
-        
-        --- SECTION 0: META/HEADER ---
-        client_name (str): Company/client name.
-        discovery_date (str): Date of discovery in YYYY-MM-DD format.
-        contact_name (str): Primary contact person's name.
-        contact_title (str): Primary contact's job title.
-        contact_email (str): Primary contact's email.
-        contact_phone (str): Primary contact's phone number.
-        industry (str): The industry the company operates in.
-        
-        --- SECTION 1: COMPANY OVERVIEW & BUSINESS OBJECTIVES ---
-        primary_business (str): Company's primary business/service offering description.
-        years_in_business (str): How long the company has been in business.
-        annual_revenue (str): Current annual revenue or revenue range (e.g., "$1-3M").
-        num_employees (int): Number of employees.
-        geographic_market (str): Geographic service area/market.
-        primary_goal_12_months (str): Primary business goal for the next 12 months.
-        target_leads_per_month (int): Target number of leads per month.
-        target_leads_timeframe (str): Timeframe for achieving target leads.
-        target_cpl_amount (str): Target cost per lead amount.
-        target_cpl_reasoning (str): How the target CPL was determined.
-        qualified_lead_definition (str): What defines a "qualified lead" for this business.
-        customer_ltv (str): Estimated customer lifetime value.
-        customer_ltv_calculation (str): How LTV is calculated.
-        sales_cycle_length (str): Typical sales cycle length (e.g., "6-8 weeks").
-        close_rate_percent (str): Percentage of leads that close.
-        close_rate_not_tracked (bool): Whether close rate is currently tracked.
-        current_monthly_leads (int): Current number of monthly leads.
-        current_lead_generation_method (str): How leads are currently generated.
-        current_sql_percent (str): Percentage of leads that are sales-qualified.
-        previous_marketing_efforts (str): JSON array of previous marketing efforts with fields: channel_name, timeframe, result, why_worked.
-        what_is_working (str): What is currently working in their marketing.
-        budget_monthly (str): Total monthly marketing budget.
-        budget_quarterly (str): Total quarterly marketing budget.
-        budget_annual (str): Total annual marketing budget.
-        leadgen_budget_monthly (str): Monthly budget allocated to lead generation.
-        leadgen_budget_quarterly (str): Quarterly budget for lead generation.
-        leadgen_budget_annual (str): Annual budget for lead generation.
-        seasonal_peak_months (str): Peak business months.
-        seasonal_slow_months (str): Slow business months.
-        seasonal_details (str): Details about seasonality.
-        
-        --- SECTION 2: TARGET AUDIENCE ---
-        ideal_customer_description (str): Description of the ideal customer.
-        decision_maker_titles (str): Job titles of decision makers.
-        decision_authority_level (str): Decision authority level (C-Suite, Director, Manager, Other).
-        target_company_size (str): Target company size (employees or revenue range).
-        target_industries (str): List of target industries.
-        geographic_focus (str): Geographic focus for customers.
-        customer_age_range (str): Target customer age range.
-        customer_gender (str): Target gender (All, Specific).
-        customer_education (str): Education level (High school, Bachelor's, Advanced, Any).
-        customer_income_range (str): Income/budget authority range.
-        pain_point_1 (str): Main customer pain point #1.
-        pain_point_2 (str): Main customer pain point #2.
-        pain_point_3 (str): Main customer pain point #3.
-        goal_motivation_1 (str): Customer goal/motivation #1.
-        goal_motivation_2 (str): Customer goal/motivation #2.
-        goal_motivation_3 (str): Customer goal/motivation #3.
-        buying_process (str): Typical buying process description.
-        secondary_audiences (str): JSON array of secondary audiences with fields: description, job_titles, why_target.
-        
-        --- SECTION 3: VALUE PROPOSITION & MESSAGING ---
-        differentiation (str): What makes the business different from competitors.
-        value_prop_1 (str): Top value proposition #1.
-        value_prop_2 (str): Top value proposition #2.
-        value_prop_3 (str): Top value proposition #3.
-        why_choose_us (str): Why prospects should choose them over competitors.
-        market_perception (str): How they want to be perceived in the market.
-        brand_voice_tones (str): JSON array of brand voice/tone selections from: "Professional / Corporate", "Casual / Conversational", "Educational / Thought Leadership", "Results-Driven / ROI-Focused", "Innovative / Forward-Thinking", "Supportive / Customer-Centric".
-        brand_voice_other (str): Other brand voice description if applicable.
-        messaging_theme_1 (str): Key messaging theme #1.
-        messaging_theme_2 (str): Key messaging theme #2.
-        messaging_theme_3 (str): Key messaging theme #3.
-        testimonials_available (str): Whether testimonials are available (Yes, Some, No).
-        testimonials_count (int): Number of testimonials/case studies available.
-        testimonials_examples (str): Examples or descriptions of testimonials.
-        proof_customer_stories (str): Customer success stories.
-        proof_statistics (str): Relevant statistics/metrics.
-        proof_awards (str): Awards/certifications.
-        proof_notable_customers (str): Notable customers.
-        
-        --- SECTION 4: COMPETITIVE LANDSCAPE ---
-        competitor_1 (str): Main competitor #1 name.
-        competitor_2 (str): Main competitor #2 name.
-        competitor_3 (str): Main competitor #3 name.
-        competitor_channels (str): JSON array of competitor channel info with fields: name, google_ads, meta_ads, social_media, seo_content, website_quality, other_channels.
-        competitor_strengths (str): What competitors are doing well.
-        competitive_advantages (str): Where they have competitive advantages.
-        
-        --- SECTION 5: SETSAIL SERVICES ASSESSMENT ---
-        services_interested (str): JSON array of services interested in: "google_ads", "meta_ads", "social_media", "seo", "website_dev".
-        services_interest_reasons (str): JSON object mapping service to reason for interest.
-        google_ads_used (bool): Whether Google Ads has been used before.
-        google_ads_experience (str): Google Ads experience level (Beginner, Intermediate, Advanced, N/A).
-        meta_ads_used (bool): Whether Meta Ads has been used before.
-        meta_ads_experience (str): Meta Ads experience level.
-        social_media_used (bool): Whether social media marketing has been used.
-        social_media_experience (str): Social media experience level.
-        seo_used (bool): Whether SEO has been used before.
-        seo_experience (str): SEO experience level.
-        website_dev_used (bool): Whether website development services were used.
-        website_dev_experience (str): Website development experience level.
-        services_not_wanted (bool): Whether there are services they specifically don't want.
-        services_not_wanted_details (str): Details on services not wanted and why.
-        
-        --- SECTION 6: CURRENT DIGITAL PRESENCE ---
-        has_website (bool): Whether they currently have a website.
-        website_url (str): Website URL.
-        website_status (str): JSON array of website status selections: "Recently built", "Needs updating / redesign", "Being built".
-        website_status_other (str): Other website status description.
-        website_monthly_visitors (int): Monthly website visitors.
-        website_conversion_rate (str): Website conversion rate.
-        website_main_issues (str): Main website issues.
-        social_platforms (str): JSON array of social platforms with fields: platform, followers, activity_level, primary_goal.
-        social_strategy (str): Current social media strategy description.
-        
-        --- SECTION 7: ANALYTICS & TRACKING ---
-        analytics_tools (str): JSON array of analytics tools used: "Google Analytics 4", "Google Analytics (Universal Analytics)", "None currently".
-        analytics_other (str): Other analytics tools.
-        crm_name (str): CRM/lead management system name.
-        crm_features_used (str): CRM features being used.
-        lead_data_tracked (str): What lead data is tracked.
-        conversion_tracking_status (str): Conversion tracking status (Yes – Fully set up, Partially set up, No – Needs to be set up).
-        conversion_tracking_details (str): Details on conversion tracking setup.
-        crm_integration_possible (str): Whether CRM integration is possible (Yes – CRM supports integrations, Unsure, No – Manual lead entry only).
-        crm_integration_details (str): Details on CRM integration possibilities.
-        
-        --- SECTION 8: CURRENT TECH STACK ---
-        tools_used (str): JSON array of tools used: "Google Workspace (Gmail, Docs, Sheets)", "Microsoft 365", "Slack", "Monday.com", "Asana", "Salesforce", "HubSpot", "Zapier".
-        tools_other (str): Other tools used.
-        
-        --- SECTION 9: TEAM & SUPPORT ---
-        poc_name (str): Primary point of contact name.
-        poc_title (str): Primary point of contact title.
-        poc_email (str): Primary point of contact email.
-        poc_phone (str): Primary point of contact phone.
-        poc_availability (str): POC availability (days/hours).
-        other_stakeholders (str): JSON array of other stakeholders with fields: name, title, role, email.
-        final_decision_name (str): Name of final decision authority.
-        final_decision_title (str): Title of final decision authority.
-        decision_timeline (str): Typical decision timeline.
-        resources_available (str): JSON array of available resources: "Brand guidelines / style guide", "Product / service information documents", etc.
-        resources_other (str): Other resources available.
-        has_dev_support (bool): Whether developer/IT support is available.
-        has_marketing_support (bool): Whether marketing support is available.
-        has_sales_support (bool): Whether sales support is available.
-        internal_resources_other (str): Other internal resources.
-        
-        --- SECTION 10: TIMELINE & EXPECTATIONS ---
-        target_launch_date (str): Target strategy launch date (YYYY-MM-DD).
-        urgency_level (str): How urgent (Very flexible, Moderate, Fast, Urgent).
-        first_leads_timeframe (str): Timeframe for first leads.
-        ramp_up_timeframe (str): Timeframe for performance ramp-up.
-        full_results_timeframe (str): Timeframe for full results.
-        success_indicator_1 (str): Success indicator #1 for first 90 days.
-        success_indicator_2 (str): Success indicator #2.
-        success_indicator_3 (str): Success indicator #3.
-        exceed_expectations (str): What would exceed expectations.
-        concern_1 (str): Biggest concern #1.
-        concern_2 (str): Biggest concern #2.
-        concern_3 (str): Biggest concern #3.
-        
-        --- SECTION 11: ADDITIONAL INFORMATION ---
-        regulatory_considerations (str): JSON array of regulatory considerations: "HIPAA (Healthcare)", "GDPR / Privacy regulations", "Financial services regulations", "Advertising restrictions", "None".
-        regulatory_other (str): Other regulatory considerations.
-        industry_keywords (str): Industry-specific keywords/terminology.
-        is_seasonal (bool): Whether the business is seasonal.
-        seasonality_peak (str): Peak season months if seasonal.
-        seasonality_slow (str): Slow season months if seasonal.
-        seasonality_strategy (str): How seasonality should affect strategy.
-        anything_else (str): Anything else to know about the business/goals.
-        success_definition (str): What would make the engagement successful.
-        case_study_consent (str): Consent to use results as case study (Yes, Maybe – ask later, No).
+        fields (DiscoveryFields): The discovery fields to set, keyed by column name. Covers the
+            meta/header, company overview & objectives, target audience, value proposition,
+            competitive landscape, services assessment, digital presence, analytics, tech stack,
+            team, timeline and additional-information sections; see each field's description.
     
     Returns:
         dict: A dictionary containing status, client_id, and the number of fields updated.
     """
-    db = get_db_session()
+    return await asyncio.to_thread(_update_discovery_document, client_id, fields)
+
+
+class DiscoveryUpdate(BaseModel):
+    """One client's entry in update_discovery_documents_bulk."""
+    model_config = ConfigDict(extra="forbid")
+
+    client_id: int = Field(description="The client ID to update the discovery document for.")
+    fields: DiscoveryFields = Field(description="The discovery fields to set, keyed by column name.")
+
+
+_DISCOVERY_EXISTING_SQL = text("SELECT client_id FROM discovery_documents WHERE client_id = ANY(:client_ids)")
+
+
+def _update_discovery_documents_bulk(items: list[DiscoveryUpdate]) -> dict:
+    """Upsert discovery fields for several clients in one transaction (blocking; run via asyncio.to_thread)."""
+    client_ids = [item.client_id for item in items]
+    if len(set(client_ids)) != len(client_ids):
+        raise ValueError("Each client_id may appear only once per bulk update.")
+    
+    results = []
+    updates, inserts = [], {}
     try:
-        # Check if discovery document exists for this client
-        existing = db.execute(
-            text("SELECT id FROM discovery_documents WHERE client_id = :client_id"),
-            {"client_id": client_id}
-        ).fetchone()
-        
-        # Build the update data - only include non-None values
-        update_data = {}
-        
-        # Helper to parse JSON strings for array/object fields
-        def parse_json_field(value: Optional[str]):
-            if value is None:
-                return None
-            try:
-                return json.loads(value)
-            except json.JSONDecodeError:
-                return value  # Return as-is if not valid JSON
-        
-        # Map all parameters to their database column names
-        field_mappings = {
-            "domain": domain,
-            "client_name": client_name,
-            "discovery_date": discovery_date,
-            "contact_name": contact_name,
-            "contact_title": contact_title,
-            "contact_email": contact_email,
-            "contact_phone": contact_phone,
-            "industry": industry,
-            "primary_business": primary_business,
-            "years_in_business": years_in_business,
-            "annual_revenue": annual_revenue,
-            "num_employees": num_employees,
-            "geographic_market": geographic_market,
-            "primary_goal_12_months": primary_goal_12_months,
-            "target_leads_per_month": target_leads_per_month,
-            "target_leads_timeframe": target_leads_timeframe,
-            "target_cpl_amount": target_cpl_amount,
-            "target_cpl_reasoning": target_cpl_reasoning,
-            "qualified_lead_definition": qualified_lead_definition,
-            "customer_ltv": customer_ltv,
-            "customer_ltv_calculation": customer_ltv_calculation,
-            "sales_cycle_length": sales_cycle_length,
-            "close_rate_percent": close_rate_percent,
-            "close_rate_not_tracked": close_rate_not_tracked,
-            "current_monthly_leads": current_monthly_leads,
-            "current_lead_generation_method": current_lead_generation_method,
-            "current_sql_percent": current_sql_percent,
-            "what_is_working": what_is_working,
-            "budget_monthly": budget_monthly,
-            "budget_quarterly": budget_quarterly,
-            "budget_annual": budget_annual,
-            "leadgen_budget_monthly": leadgen_budget_monthly,
-            "leadgen_budget_quarterly": leadgen_budget_quarterly,
-            "leadgen_budget_annual": leadgen_budget_annual,
-            "seasonal_peak_months": seasonal_peak_months,
-            "seasonal_slow_months": seasonal_slow_months,
-            "seasonal_details": seasonal_details,
-            "ideal_customer_description": ideal_customer_description,
-            "decision_maker_titles": decision_maker_titles,
-            "decision_authority_level": decision_authority_level,
-            "target_company_size": target_company_size,
-            "target_industries": target_industries,
-            "geographic_focus": geographic_focus,
-            "customer_age_range": customer_age_range,
-            "customer_gender": customer_gender,
-            "customer_education": customer_education,
-            "customer_income_range": customer_income_range,
-            "pain_point_1": pain_point_1,
-            "pain_point_2": pain_point_2,
-            "pain_point_3": pain_point_3,
-            "goal_motivation_1": goal_motivation_1,
-            "goal_motivation_2": goal_motivation_2,
-            "goal_motivation_3": goal_motivation_3,
-            "buying_process": buying_process,
-            "differentiation": differentiation,
-            "value_prop_1": value_prop_1,
-            "value_prop_2": value_prop_2,
-            "value_prop_3": value_prop_3,
-            "why_choose_us": why_choose_us,
-            "market_perception": market_perception,
-            "brand_voice_other": brand_voice_other,
-            "messaging_theme_1": messaging_theme_1,
-            "messaging_theme_2": messaging_theme_2,
-            "messaging_theme_3": messaging_theme_3,
-            "testimonials_available": testimonials_available,
-            "testimonials_count": testimonials_count,
-            "testimonials_examples": testimonials_examples,
-            "proof_customer_stories": proof_customer_stories,
-            "proof_statistics": proof_statistics,
-            "proof_awards": proof_awards,
-            "proof_notable_customers": proof_notable_customers,
-            "competitor_1": competitor_1,
-            "competitor_2": competitor_2,
-            "competitor_3": competitor_3,
-            "competitor_strengths": competitor_strengths,
-            "competitive_advantages": competitive_advantages,
-            "google_ads_used": google_ads_used,
-            "google_ads_experience": google_ads_experience,
-            "meta_ads_used": meta_ads_used,
-            "meta_ads_experience": meta_ads_experience,
-            "social_media_used": social_media_used,
-            "social_media_experience": social_media_experience,
-            "seo_used": seo_used,
-            "seo_experience": seo_experience,
-            "website_dev_used": website_dev_used,
-            "website_dev_experience": website_dev_experience,
-            "services_not_wanted": services_not_wanted,
-            "services_not_wanted_details": services_not_wanted_details,
-            "has_website": has_website,
-            "website_url": website_url,
-            "website_status_other": website_status_other,
-            "website_monthly_visitors": website_monthly_visitors,
-            "website_conversion_rate": website_conversion_rate,
-            "website_main_issues": website_main_issues,
-            "social_strategy": social_strategy,
-            "analytics_other": analytics_other,
-            "crm_name": crm_name,
-            "crm_features_used": crm_features_used,
-            "lead_data_tracked": lead_data_tracked,
-            "conversion_tracking_status": conversion_tracking_status,
-            "conversion_tracking_details": conversion_tracking_details,
-            "crm_integration_possible": crm_integration_possible,
-            "crm_integration_details": crm_integration_details,
-            "tools_other": tools_other,
-            "poc_name": poc_name,
-            "poc_title": poc_title,
-            "poc_email": poc_email,
-            "poc_phone": poc_phone,
-            "poc_availability": poc_availability,
-            "final_decision_name": final_decision_name,
-            "final_decision_title": final_decision_title,
-            "decision_timeline": decision_timeline,
-            "resources_other": resources_other,
-            "has_dev_support": has_dev_support,
-            "has_marketing_support": has_marketing_support,
-            "has_sales_support": has_sales_support,
-            "internal_resources_other": internal_resources_other,
-            "target_launch_date": target_launch_date,
-            "urgency_level": urgency_level,
-            "first_leads_timeframe": first_leads_timeframe,
-            "ramp_up_timeframe": ramp_up_timeframe,
-            "full_results_timeframe": full_results_timeframe,
-            "success_indicator_1": success_indicator_1,
-            "success_indicator_2": success_indicator_2,
-            "success_indicator_3": success_indicator_3,
-            "exceed_expectations": exceed_expectations,
-            "concern_1": concern_1,
-            "concern_2": concern_2,
-            "concern_3": concern_3,
-            "regulatory_other": regulatory_other,
-            "industry_keywords": industry_keywords,
-            "is_seasonal": is_seasonal,
-            "seasonality_peak": seasonality_peak,
-            "seasonality_slow": seasonality_slow,
-            "seasonality_strategy": seasonality_strategy,
-            "anything_else": anything_else,
-            "success_definition": success_definition,
-            "case_study_consent": case_study_consent,
-        }
-        
-        # JSON fields that need parsing
-        json_field_mappings = {
-            "previous_marketing_efforts": previous_marketing_efforts,
-            "secondary_audiences": secondary_audiences,
-            "brand_voice_tones": brand_voice_tones,
-            "competitor_channels": competitor_channels,
-            "services_interested": services_interested,
-            "services_interest_reasons": services_interest_reasons,
-            "website_status": website_status,
-            "social_platforms": social_platforms,
-            "analytics_tools": analytics_tools,
-            "tools_used": tools_used,
-            "other_stakeholders": other_stakeholders,
-            "resources_available": resources_available,
-            "regulatory_considerations": regulatory_considerations,
-        }
-        
-        # Add non-None simple fields
-        for field, value in field_mappings.items():
-            if value is not None:
-                update_data[field] = value
-        
-        # Add non-None JSON fields (parse them first)
-        for field, value in json_field_mappings.items():
-            if value is not None:
-                parsed = parse_json_field(value)
-                if parsed is not None:
-                    # If parsing failed and we got a plain string back,
-                    # wrap it in an array since these fields expect arrays
-                    if isinstance(parsed, str):
-                        parsed = [parsed]
-                    update_data[field] = json.dumps(parsed)
-        
-        if not update_data:
-            return {
-                "status": "no_changes",
-                "client_id": client_id,
-                "message": "No fields provided to update"
+        with _session_scope() as db:
+            existing_ids = {
+                row[0] for row in db.execute(
+                    _DISCOVERY_EXISTING_SQL,
+                    {"client_ids": client_ids}
+                )
             }
         
-        if existing:
-            # Update existing document
-            set_clauses = ", ".join([f"{k} = :{k}" for k in update_data.keys()])
-            update_data["client_id"] = client_id
-            db.execute(
-                text(f"UPDATE discovery_documents SET {set_clauses}, updated_at = NOW() WHERE client_id = :client_id"),
-                update_data
-            )
-            action = "updated"
-        else:
-            # Create new document
-            update_data["client_id"] = client_id
-            update_data["edit_token"] = secrets.token_urlsafe(32)
-            columns = ", ".join(update_data.keys())
-            placeholders = ", ".join([f":{k}" for k in update_data.keys()])
-            db.execute(
-                text(f"INSERT INTO discovery_documents ({columns}) VALUES ({placeholders})"),
-                update_data
-            )
-            action = "created"
-        
-        db.commit()
+            for item in items:
+                update_data = _discovery_update_data(item.fields)
+                field_names = list(update_data)
+                if not update_data:
+                    results.append({"client_id": item.client_id, "action": "no_changes", "field_names": []})
+                    continue
+                if item.client_id in existing_ids:
+                    params = _DISCOVERY_NULL_PARAMS.copy()
+                    params.update(update_data)
+                    params["client_id"] = item.client_id
+                    updates.append(params)
+                    results.append({"client_id": item.client_id, "action": "updated", "field_names": field_names})
+                else:
+                    update_data["client_id"] = item.client_id
+                    update_data["edit_token"] = _edit_token()
+                    # Group inserts by column set so each group is one multi-row INSERT
+                    inserts.setdefault(tuple(update_data), []).append(update_data)
+                    results.append({"client_id": item.client_id, "action": "created", "field_names": field_names})
+        
+            if updates:
+                db.execute(_DISCOVERY_UPDATE_MANY_SQL, updates)
+            for rows in inserts.values():
+                # One multi-row INSERT ... VALUES (...), (...) per column set
+                db.execute(_discovery_table.insert().values(rows))
         
         return {
             "status": "success",
-            "action": action,
-            "client_id": client_id,
-            "fields_updated": len(update_data) - (2 if action == "created" else 1),  # Exclude client_id and edit_token from count
-            "field_names": list(k for k in update_data.keys() if k not in ("client_id", "edit_token"))
+            "created": sum(len(rows) for rows in inserts.values()),
+            "updated": len(updates),
+            "results": results
         }
         
     except Exception as e:
-        db.rollback()
-        raise Exception(f"Failed to update discovery document: {str(e)}")
-    finally:
-        db.close()
+        raise Exception(f"Failed to update discovery documents: {str(e)}")
+
+
+@mcp.tool
+async def update_discovery_documents_bulk(items: list[DiscoveryUpdate]) -> dict:
+    """
+    Updates or creates discovery documents for many clients in one transaction.
+    Use this instead of repeated update_discovery_document calls when filling in several clients.
+    
+    Args:
+        items (list[DiscoveryUpdate]): One entry per client, each with client_id and fields
+            (same fields as update_discovery_document). A client may appear only once.
+    
+    Returns:
+        dict: status plus per-client results, each with client_id, action
+              ('created', 'updated' or 'no_changes') and field_names.
+    """
+    return await asyncio.to_thread(_update_discovery_documents_bulk, items)
+
+
+_DISCOVERY_SELECT_SQL = text("SELECT * FROM discovery_documents WHERE client_id = :client_id")
+
+
+def _get_discovery_document(client_id: int) -> dict:
+    """Fetch one client's discovery document (blocking; run via asyncio.to_thread)."""
+    with _db_reader() as conn:
+        result = conn.execute(
+            _DISCOVERY_SELECT_SQL,
+            {"client_id": client_id}
+        ).mappings().fetchone()
+    
+    if not result:
+        raise ValueError(f"Discovery document not found for client_id={client_id}")
+    
+    return dict(result)
 
 
 @mcp.tool
-def get_discovery_document(client_id: int) -> dict:
+async def get_discovery_document(client_id: int) -> dict:
     """
     Fetches the discovery document for a client.
     
@@ -1945,21 +2636,7 @@ def get_discovery_document(client_id: int) -> dict:
     Returns:
         dict: The discovery document data including all fields.
     """
-    db = get_db_session()
-    try:
-        result = db.execute(
-            text("SELECT * FROM discovery_documents WHERE client_id = :client_id"),
-            {"client_id": client_id}
-        ).fetchone()
-        
-        if not result:
-            raise ValueError(f"Discovery document not found for client_id={client_id}")
-        
-        # Convert row to dictionary
-        columns = result._mapping.keys()
-        return {col: result._mapping[col] for col in columns}
-    finally:
-        db.close()
+    return await asyncio.to_thread(_get_discovery_document, client_id)
 
 
 # =============================================================================
@@ -1987,6 +2664,11 @@ STRATEGY_SECTIONS = {
     "appendix_b": "Key Contacts",
     "appendix_c": "Sitemap with recommended Keywords",
 }
+# Section keys in document order, and the error-message listing of them, built once
+_STRATEGY_KEYS = tuple(STRATEGY_SECTIONS)
+_VALID_STRATEGY_KEYS_REPR = repr(list(_STRATEGY_KEYS))
+# Rule between sections in readStrategy's assembled full_document
+_STRATEGY_SECTION_SEPARATOR = "\n\n---\n\n"
 
 # SQL to create strategies table if it doesn't exist
 STRATEGIES_TABLE_SQL = """
@@ -2018,139 +2700,105 @@ CREATE TABLE IF NOT EXISTS strategies (
 );
 """
 
+# Section markdown is TOASTed (compressed at rest) by Postgres; lz4 compresses/decompresses much
+# faster than the default pglz. Applies to values written after the change (Postgres 14+).
+STRATEGIES_COMPRESSION_SQL = "ALTER TABLE strategies " + ", ".join(
+    f"ALTER COLUMN {key} SET COMPRESSION lz4" for key in _STRATEGY_KEYS
+)
+
 def _ensure_strategies_table():
-    """Ensure the strategies table exists."""
+    """Ensure the strategies table exists and its section columns use lz4 compression."""
     if not _engine:
         return
-    db = get_db_session()
     try:
-        db.execute(text(STRATEGIES_TABLE_SQL))
-        db.commit()
+        with _db_writer() as conn:
+            conn.execute(text(STRATEGIES_TABLE_SQL))
+    except Exception:
+        pass  # Table might already exist, that's fine
+    try:
+        with _db_writer() as conn:
+            conn.execute(text(STRATEGIES_COMPRESSION_SQL))
     except Exception as e:
-        db.rollback()
-        # Table might already exist, that's fine
-    finally:
-        db.close()
+        logger.warning("Could not set lz4 compression on strategies: %s", e)
+
 
-# Ensure table exists on module load
-if _engine:
+def migrate():
+    """Run all DDL this server relies on (indexes, strategies table, compression). Run at deploy: python migrate.py"""
+    _ensure_indexes()
     _ensure_strategies_table()
+    _ensure_compression()
+
+# Importing the server does no DB I/O; AUTO_MIGRATE=1 runs the DDL on import for local dev
+if _engine and os.getenv("AUTO_MIGRATE") == "1":
+    migrate()
+
+
+_STRATEGY_SQL = text("""
+    SELECT * FROM strategies 
+    WHERE client_id = :client_id AND version_number = :version_number
+""")
 
 
 def _get_strategy(client_id: int, version_number: int) -> dict | None:
     """Fetch a strategy by client_id and version_number."""
-    db = get_db_session()
-    try:
-        result = db.execute(
-            text("""
-                SELECT * FROM strategies 
-                WHERE client_id = :client_id AND version_number = :version_number
-            """),
+    with _db_reader() as conn:
+        result = conn.execute(
+            _STRATEGY_SQL,
             {"client_id": client_id, "version_number": version_number}
-        ).fetchone()
-        
-        if not result:
-            return None
-        
-        columns = result._mapping.keys()
-        return {col: result._mapping[col] for col in columns}
-    finally:
-        db.close()
+        ).mappings().fetchone()
+    
+    return dict(result) if result else None
 
 
-def _get_latest_strategy_version(client_id: int) -> int:
-    """Get the latest version number for a client's strategy."""
-    db = get_db_session()
-    try:
-        result = db.execute(
-            text("""
-                SELECT COALESCE(MAX(version_number), 0) as max_version
-                FROM strategies WHERE client_id = :client_id
-            """),
-            {"client_id": client_id}
-        ).fetchone()
-        return result[0] if result else 0
-    finally:
-        db.close()
+# One UPDATE per section, built once; section_key is validated against STRATEGY_SECTIONS
+_STRATEGY_SECTION_UPDATE_SQL = {
+    key: text(f"""
+        UPDATE strategies
+        SET {key} = :content, updated_at = NOW()
+        WHERE client_id = :client_id AND version_number = :version_number
+    """)
+    for key in STRATEGY_SECTIONS
+}
 
 
 def _update_strategy_section(client_id: int, version_number: int, section_key: str, content: str) -> dict:
     """Update a single section of a strategy."""
     if section_key not in STRATEGY_SECTIONS:
-        raise ValueError(f"Invalid section key: {section_key}. Valid keys: {list(STRATEGY_SECTIONS.keys())}")
+        raise ValueError(f"Invalid section key: {section_key}. Valid keys: {_VALID_STRATEGY_KEYS_REPR}")
     
-    db = get_db_session()
-    try:
-        # Check if strategy exists
-        existing = _get_strategy(client_id, version_number)
-        if not existing:
-            raise ValueError(f"Strategy not found for client_id={client_id}, version_number={version_number}")
-        
-        # Update the section
-        db.execute(
-            text(f"""
-                UPDATE strategies 
-                SET {section_key} = :content, updated_at = NOW()
-                WHERE client_id = :client_id AND version_number = :version_number
-            """),
+    with _db_writer() as conn:
+        # No matched row means the strategy doesn't exist; no separate existence check needed
+        updated = conn.execute(
+            _STRATEGY_SECTION_UPDATE_SQL[section_key],
             {"content": content, "client_id": client_id, "version_number": version_number}
-        )
-        db.commit()
-        
-        return {
-            "status": "success",
-            "client_id": client_id,
-            "version_number": version_number,
-            "section_key": section_key,
-            "section_name": STRATEGY_SECTIONS[section_key],
-            "content_length": len(content)
-        }
-    except Exception as e:
-        db.rollback()
-        raise
-    finally:
-        db.close()
-
-
-
-
-def _assemble_full_strategy(strategy: dict) -> str:
-    """Assemble all sections into a full strategy document."""
-    parts = []
-    
-    # Add executive summary first
-    if strategy.get("executive_summary"):
-        parts.append(strategy["executive_summary"])
-        parts.append("\n\n---\n\n")
-    
-    # Add numbered sections 1-14
-    for i in range(1, 15):
-        section_key = f"section_{i}"
-        if strategy.get(section_key):
-            parts.append(strategy[section_key])
-            parts.append("\n\n---\n\n")
-    
-    # Add appendices
-    if strategy.get("appendix_a"):
-        parts.append(strategy["appendix_a"])
-        parts.append("\n\n---\n\n")
-    
-    if strategy.get("appendix_b"):
-        parts.append(strategy["appendix_b"])
-        parts.append("\n\n---\n\n")
-    
-    if strategy.get("appendix_c"):
-        parts.append(strategy["appendix_c"])
+        ).rowcount
+    if not updated:
+        raise ValueError(f"Strategy not found for client_id={client_id}, version_number={version_number}")
     
-    return "".join(parts).strip()
+    return {
+        "status": "success",
+        "client_id": client_id,
+        "version_number": version_number,
+        "section_key": section_key,
+        "section_name": STRATEGY_SECTIONS[section_key],
+        "content_length": len(content)
+    }
 
 
 # =============================================================================
 # STRATEGY MCP TOOLS
 # =============================================================================
 
+def _read_strategy_document(client_id: int, version_number: int) -> dict:
+    """Fetch a strategy version through the read cache (blocking; run via asyncio.to_thread)."""
+    updated_at = _get_strategy_updated_at(client_id, version_number)
+    if updated_at is None:
+        raise ValueError(f"Strategy not found for client_id={client_id}, version_number={version_number}")
+    return _read_strategy(client_id, version_number, updated_at)
+
+
 @mcp.tool
-def readStrategy(client_id: int, version_number: int) -> dict:
+async def readStrategy(client_id: int, version_number: int) -> dict:
     """
     Reads a complete strategy document for a client.
     
@@ -2161,23 +2809,56 @@ def readStrategy(client_id: int, version_number: int) -> dict:
     Returns:
         dict: A dictionary containing the full assembled strategy and individual sections.
     """
+    return await asyncio.to_thread(_read_strategy_document, client_id, version_number)
+
+
+# Only updated_at, found through the UNIQUE (client_id, version_number) index
+_STRATEGY_UPDATED_AT_SQL = text("""
+    SELECT updated_at FROM strategies
+    WHERE client_id = :client_id AND version_number = :version_number
+""")
+# Assembled readStrategy results keyed by (client_id, version_number, updated_at); every section
+# edit bumps updated_at, so a changed strategy simply misses and stale entries age out
+_strategy_documents: LRUCache = LRUCache(maxsize=256)
+_strategy_documents_lock = threading.Lock()
+
+
+def _get_strategy_updated_at(client_id: int, version_number: int):
+    """Return the strategy's updated_at, or None if the strategy doesn't exist."""
+    with _db_reader() as conn:
+        row = conn.execute(
+            _STRATEGY_UPDATED_AT_SQL,
+            {"client_id": client_id, "version_number": version_number}
+        ).fetchone()
+    return row[0] if row else None
+
+
+def _read_strategy(client_id: int, version_number: int, updated_at) -> dict:
+    """
+    Assembled strategy for the state stamped updated_at, served from _strategy_documents when
+    unchanged. Raises ValueError if the strategy has been deleted in the meantime.
+    """
+    with _strategy_documents_lock:
+        cached = _strategy_documents.get((client_id, version_number, updated_at))
+    if cached is not None:
+        return cached
+
     strategy = _get_strategy(client_id, version_number)
     
     if not strategy:
         raise ValueError(f"Strategy not found for client_id={client_id}, version_number={version_number}")
     
-    # Assemble the full document
-    full_document = _assemble_full_strategy(strategy)
-    
-    # Build sections dict with names
+    # Build the sections dict and the full document's non-empty parts in one pass
     sections = {}
+    parts = []
     for key, name in STRATEGY_SECTIONS.items():
-        sections[key] = {
-            "name": name,
-            "content": strategy.get(key) or ""
-        }
+        content = strategy.get(key) or ""
+        sections[key] = {"name": name, "content": content}
+        if content:
+            parts.append(content)
+    full_document = _STRATEGY_SECTION_SEPARATOR.join(parts)
     
-    return {
+    result = {
         "client_id": client_id,
         "version_number": version_number,
         "created_at": str(strategy.get("created_at", "")),
@@ -2185,92 +2866,116 @@ def readStrategy(client_id: int, version_number: int) -> dict:
         "full_document": full_document,
         "sections": sections
     }
-
-
-@mcp.tool
-def listStrategyVersions(client_id: int) -> dict:
-    """
-    Lists all strategy versions for a client.
+    # Key on the row actually read: it may be newer than the updated_at the caller checked
+    with _strategy_documents_lock:
+        _strategy_documents[(client_id, version_number, strategy.get("updated_at"))] = result
+    return result
+
+
+# One page plus the client's total; the page is a backward scan of the UNIQUE
+# (client_id, version_number) index. Always returns a row (with NULL columns when the page is empty).
+_STRATEGY_VERSIONS_SQL = text("""
+    SELECT v.version_number, v.created_at, v.updated_at, t.total_versions
+    FROM (SELECT COUNT(*) AS total_versions FROM strategies WHERE client_id = :client_id) t
+    LEFT JOIN LATERAL (
+        SELECT version_number, created_at, updated_at
+        FROM strategies
+        WHERE client_id = :client_id
+        ORDER BY version_number DESC
+        LIMIT :limit OFFSET :offset
+    ) v ON TRUE
+""")
+STRATEGY_VERSIONS_MAX_LIMIT = 500
+
+
+def _list_strategy_versions(client_id: int, limit: int = 50, offset: int = 0) -> dict:
+    """List a client's strategy versions (blocking; run via asyncio.to_thread)."""
+    limit = max(1, min(limit, STRATEGY_VERSIONS_MAX_LIMIT))
+    offset = max(0, offset)
+    with _db_reader() as conn:
+        results = conn.execute(
+            _STRATEGY_VERSIONS_SQL,
+            {"client_id": client_id, "limit": limit, "offset": offset}
+        ).fetchall()
     
-    Args:
-        client_id (int): The client ID.
+    total_versions = results[0][3]
+    versions = []
+    for row in results:
+        if row[0] is None:
+            continue  # empty page
+        versions.append({
+            "version_number": row[0],
+            "created_at": str(row[1]) if row[1] else None,
+            "updated_at": str(row[2]) if row[2] else None,
+        })
     
-    Returns:
-        dict: A dictionary containing a list of versions with their metadata.
-    """
-    db = get_db_session()
-    try:
-        results = db.execute(
-            text("""
-                SELECT version_number, created_at, updated_at
-                FROM strategies
-                WHERE client_id = :client_id
-                ORDER BY version_number DESC
-            """),
-            {"client_id": client_id}
-        ).fetchall()
-        
-        versions = []
-        for row in results:
-            versions.append({
-                "version_number": row[0],
-                "created_at": str(row[1]) if row[1] else None,
-                "updated_at": str(row[2]) if row[2] else None,
-            })
-        
-        return {
-            "client_id": client_id,
-            "total_versions": len(versions),
-            "versions": versions
-        }
-    finally:
-        db.close()
+    return {
+        "client_id": client_id,
+        "total_versions": total_versions,
+        "limit": limit,
+        "offset": offset,
+        "has_more": offset + len(versions) < total_versions,
+        "versions": versions
+    }
 
 
 @mcp.tool
-def createStrategy(client_id: int, copy_from_version: Optional[int] = None) -> dict:
+async def listStrategyVersions(client_id: int, limit: int = 50, offset: int = 0) -> dict:
     """
-    Creates a new strategy version for a client.
+    Lists strategy versions for a client, newest first, one page at a time.
     
     Args:
         client_id (int): The client ID.
-        copy_from_version (int, optional): If provided, copies content from this version.
-            If not provided, creates a blank strategy.
+        limit (int): Maximum number of versions to return (1-500, default 50).
+        offset (int): Number of newest versions to skip (default 0).
     
     Returns:
-        dict: A dictionary containing the new version number and status.
-    """
-    db = get_db_session()
+        dict: A dictionary containing total_versions, a page of versions with their metadata,
+              and whether more exist.
+    """
+    return await asyncio.to_thread(_list_strategy_versions, client_id, limit, offset)
+
+
+# UNIQUE(client_id, version_number) rejects a version taken by a concurrent create
+_CREATE_STRATEGY_ATTEMPTS = 3
+_NEXT_STRATEGY_VERSION = "(SELECT COALESCE(MAX(version_number), 0) + 1 FROM strategies WHERE client_id = :client_id)"
+_CREATE_BLANK_STRATEGY_SQL = text(f"""
+    INSERT INTO strategies (client_id, version_number)
+    VALUES (:client_id, {_NEXT_STRATEGY_VERSION})
+    RETURNING version_number
+""")
+# Inserts nothing (so RETURNING yields no row) when the source version doesn't exist
+_COPY_STRATEGY_SQL = text(f"""
+    INSERT INTO strategies (client_id, version_number, {", ".join(_STRATEGY_KEYS)})
+    SELECT :client_id, {_NEXT_STRATEGY_VERSION}, {", ".join(_STRATEGY_KEYS)}
+    FROM strategies
+    WHERE client_id = :client_id AND version_number = :copy_from_version
+    RETURNING version_number
+""")
+
+
+def _create_strategy(client_id: int, copy_from_version: Optional[int] = None) -> dict:
+    """Create the next strategy version for a client (blocking; run via asyncio.to_thread)."""
     try:
-        # Get the next version number
-        current_max = _get_latest_strategy_version(client_id)
-        new_version = current_max + 1
-        
-        # Prepare insert data
-        insert_data = {
-            "client_id": client_id,
-            "version_number": new_version,
-        }
-        
-        # If copying from an existing version, get that data
-        if copy_from_version is not None:
-            source = _get_strategy(client_id, copy_from_version)
-            if not source:
-                raise ValueError(f"Source strategy not found: client_id={client_id}, version={copy_from_version}")
-            
-            # Copy all section content
-            for key in STRATEGY_SECTIONS.keys():
-                insert_data[key] = source.get(key)
-        
-        # Build and execute insert
-        columns = ", ".join(insert_data.keys())
-        placeholders = ", ".join([f":{k}" for k in insert_data.keys()])
+        for attempt in range(_CREATE_STRATEGY_ATTEMPTS):
+            try:
+                # Next version number, source copy and insert all happen server-side in one statement
+                with _db_writer() as conn:
+                    if copy_from_version is None:
+                        new_version = conn.execute(_CREATE_BLANK_STRATEGY_SQL, {"client_id": client_id}).scalar()
+                    else:
+                        new_version = conn.execute(
+                            _COPY_STRATEGY_SQL,
+                            {"client_id": client_id, "copy_from_version": copy_from_version}
+                        ).scalar()
+                break
+            except IntegrityError:
+                # A concurrent createStrategy took the same version number; recompute and retry
+                if attempt == _CREATE_STRATEGY_ATTEMPTS - 1:
+                    raise
         
-        db.execute(
-            text(f"INSERT INTO strategies ({columns}) VALUES ({placeholders})"),
-            insert_data
-        )
-        db.commit()
+        if new_version is None:
+            raise ValueError(f"Source strategy not found: client_id={client_id}, version={copy_from_version}")
         
         return {
             "status": "success",
@@ -2280,320 +2985,135 @@ def createStrategy(client_id: int, copy_from_version: Optional[int] = None) -> d
             "message": f"Created strategy version {new_version}" + (f" (copied from v{copy_from_version})" if copy_from_version else " (blank)")
         }
     except Exception as e:
-        db.rollback()
         raise Exception(f"Failed to create strategy: {str(e)}")
-    finally:
-        db.close()
-
-
-# --- Edit tools for each section ---
-# These tools take the content directly and write it to the database.
-# The AI agent (The Cook) generates the content and calls these tools.
-
-@mcp.tool
-def editStrategyExecutiveSummary(client_id: int, version_number: int, content: str) -> dict:
-    """
-    Updates the Executive Summary section of a strategy.
-    
-    Args:
-        client_id (int): The client ID.
-        version_number (int): The strategy version to edit.
-        content (str): The new content for this section (markdown format).
-    
-    Returns:
-        dict: Status and the updated section content.
-    """
-    return _update_strategy_section(client_id, version_number, "executive_summary", content)
-
-
-@mcp.tool
-def editStrategySection1(client_id: int, version_number: int, content: str) -> dict:
-    """
-    Updates Section 1: Strategic Foundation of a strategy.
-    
-    Args:
-        client_id (int): The client ID.
-        version_number (int): The strategy version to edit.
-        content (str): The new content for this section (markdown format).
-    
-    Returns:
-        dict: Status and the updated section content.
-    """
-    return _update_strategy_section(client_id, version_number, "section_1", content)
-
-
-@mcp.tool
-def editStrategySection2(client_id: int, version_number: int, content: str) -> dict:
-    """
-    Updates Section 2: Market & Competitive Analysis of a strategy.
-    
-    Args:
-        client_id (int): The client ID.
-        version_number (int): The strategy version to edit.
-        content (str): The new content for this section (markdown format).
-    
-    Returns:
-        dict: Status and the updated section content.
-    """
-    return _update_strategy_section(client_id, version_number, "section_2", content)
-
-
-@mcp.tool
-def editStrategySection3(client_id: int, version_number: int, content: str) -> dict:
-    """
-    Updates Section 3: Audience Intelligence of a strategy.
-    
-    Args:
-        client_id (int): The client ID.
-        version_number (int): The strategy version to edit.
-        content (str): The new content for this section (markdown format).
-    
-    Returns:
-        dict: Status and the updated section content.
-    """
-    return _update_strategy_section(client_id, version_number, "section_3", content)
-
-
-@mcp.tool
-def editStrategySection4(client_id: int, version_number: int, content: str) -> dict:
-    """
-    Updates Section 4: Value Proposition & Messaging of a strategy.
-    
-    Args:
-        client_id (int): The client ID.
-        version_number (int): The strategy version to edit.
-        content (str): The new content for this section (markdown format).
-    
-    Returns:
-        dict: Status and the updated section content.
-    """
-    return _update_strategy_section(client_id, version_number, "section_4", content)
-
-
-@mcp.tool
-def editStrategySection5(client_id: int, version_number: int, content: str) -> dict:
-    """
-    Updates Section 5: Setsail Services Overview of a strategy.
-    
-    Args:
-        client_id (int): The client ID.
-        version_number (int): The strategy version to edit.
-        content (str): The new content for this section (markdown format).
-    
-    Returns:
-        dict: Status and the updated section content.
-    """
-    return _update_strategy_section(client_id, version_number, "section_5", content)
-
-
-@mcp.tool
-def editStrategySection6(client_id: int, version_number: int, content: str) -> dict:
-    """
-    Updates Section 6: Google Ads Management of a strategy.
-    
-    Args:
-        client_id (int): The client ID.
-        version_number (int): The strategy version to edit.
-        content (str): The new content for this section (markdown format).
-    
-    Returns:
-        dict: Status and the updated section content.
-    """
-    return _update_strategy_section(client_id, version_number, "section_6", content)
-
-
-@mcp.tool
-def editStrategySection7(client_id: int, version_number: int, content: str) -> dict:
-    """
-    Updates Section 7: Social Media Management of a strategy.
-    
-    Args:
-        client_id (int): The client ID.
-        version_number (int): The strategy version to edit.
-        content (str): The new content for this section (markdown format).
-    
-    Returns:
-        dict: Status and the updated section content.
-    """
-    return _update_strategy_section(client_id, version_number, "section_7", content)
-
-
-@mcp.tool
-def editStrategySection8(client_id: int, version_number: int, content: str) -> dict:
-    """
-    Updates Section 8: SEO Services of a strategy.
-    
-    Args:
-        client_id (int): The client ID.
-        version_number (int): The strategy version to edit.
-        content (str): The new content for this section (markdown format).
-    
-    Returns:
-        dict: Status and the updated section content.
-    """
-    return _update_strategy_section(client_id, version_number, "section_8", content)
-
-
-@mcp.tool
-def editStrategySection9(client_id: int, version_number: int, content: str) -> dict:
-    """
-    Updates Section 9: Overall Performance Targets of a strategy.
-    
-    Args:
-        client_id (int): The client ID.
-        version_number (int): The strategy version to edit.
-        content (str): The new content for this section (markdown format).
-    
-    Returns:
-        dict: Status and the updated section content.
-    """
-    return _update_strategy_section(client_id, version_number, "section_9", content)
 
 
 @mcp.tool
-def editStrategySection10(client_id: int, version_number: int, content: str) -> dict:
+async def createStrategy(client_id: int, copy_from_version: Optional[int] = None) -> dict:
     """
-    Updates Section 10: Execution Timeline of a strategy.
+    Creates a new strategy version for a client.
     
     Args:
         client_id (int): The client ID.
-        version_number (int): The strategy version to edit.
-        content (str): The new content for this section (markdown format).
+        copy_from_version (int, optional): If provided, copies content from this version.
+            If not provided, creates a blank strategy.
     
     Returns:
-        dict: Status and the updated section content.
+        dict: A dictionary containing the new version number and status.
     """
-    return _update_strategy_section(client_id, version_number, "section_10", content)
+    return await asyncio.to_thread(_create_strategy, client_id, copy_from_version)
 
 
-@mcp.tool
-def editStrategySection11(client_id: int, version_number: int, content: str) -> dict:
-    """
-    Updates Section 11: Budget & Investment of a strategy.
-    
-    Args:
-        client_id (int): The client ID.
-        version_number (int): The strategy version to edit.
-        content (str): The new content for this section (markdown format).
-    
-    Returns:
-        dict: Status and the updated section content.
-    """
-    return _update_strategy_section(client_id, version_number, "section_11", content)
-
+# --- Edit tools for each section ---
+# These tools take the content directly and write it to the database.
+# The AI agent (The Cook) generates the content and calls these tools.
 
-@mcp.tool
-def editStrategySection12(client_id: int, version_number: int, content: str) -> dict:
-    """
-    Updates Section 12: Communication & Support of a strategy.
-    
-    Args:
-        client_id (int): The client ID.
-        version_number (int): The strategy version to edit.
-        content (str): The new content for this section (markdown format).
-    
-    Returns:
-        dict: Status and the updated section content.
-    """
-    return _update_strategy_section(client_id, version_number, "section_12", content)
+# Extra guidance appended to a section's edit-tool docstring
+_STRATEGY_EDIT_NOTES = {
+    "appendix_c": (
+        "Use get_kw_sitemap(client_id) to obtain the current keyword enhanced sitemap (NDJSON).\n"
+        "    Use update_kw_sitemap(client_id) to regenerate the sitemap before editing if needed.\n"
+    ),
+}
+_STRATEGY_EDIT_CONTENT_DOCS = {
+    "appendix_c": "markdown format; typically the sitemap with recommended keywords",
+}
 
 
-@mcp.tool
-def editStrategySection13(client_id: int, version_number: int, content: str) -> dict:
-    """
-    Updates Section 13: Success Indicators of a strategy.
+def _make_strategy_edit_tool(section_key: str, section_name: str):
+    """Build the edit tool for one section: editStrategyExecutiveSummary, editStrategySection1, ..., editStrategyAppendixC."""
+    async def edit_section(client_id: int, version_number: int, content: str) -> dict:
+        return await asyncio.to_thread(_update_strategy_section, client_id, version_number, section_key, content)
     
+    if section_key == "executive_summary":
+        heading = "the Executive Summary section"
+    else:
+        heading = f"{section_key.replace('_', ' ').title()}: {section_name}"
+    edit_section.__name__ = edit_section.__qualname__ = f"editStrategy{section_key.title().replace('_', '')}"
+    edit_section.__doc__ = f"""
+    Updates {heading} of a strategy.
+    {_STRATEGY_EDIT_NOTES.get(section_key, "")}
     Args:
         client_id (int): The client ID.
         version_number (int): The strategy version to edit.
-        content (str): The new content for this section (markdown format).
+        content (str): The new content for this section ({_STRATEGY_EDIT_CONTENT_DOCS.get(section_key, "markdown format")}).
     
     Returns:
         dict: Status and the updated section content.
     """
-    return _update_strategy_section(client_id, version_number, "section_13", content)
+    return edit_section
 
 
-@mcp.tool
-def editStrategySection14(client_id: int, version_number: int, content: str) -> dict:
-    """
-    Updates Section 14: Next Steps & Kickoff of a strategy.
-    
-    Args:
-        client_id (int): The client ID.
-        version_number (int): The strategy version to edit.
-        content (str): The new content for this section (markdown format).
-    
-    Returns:
-        dict: Status and the updated section content.
-    """
-    return _update_strategy_section(client_id, version_number, "section_14", content)
+for _section_key, _section_name in STRATEGY_SECTIONS.items():
+    mcp.tool(_make_strategy_edit_tool(_section_key, _section_name))
 
 
-@mcp.tool
-def editStrategyAppendixA(client_id: int, version_number: int, content: str) -> dict:
-    """
-    Updates Appendix A: Glossary of Terms of a strategy.
-    
-    Args:
-        client_id (int): The client ID.
-        version_number (int): The strategy version to edit.
-        content (str): The new content for this section (markdown format).
-    
-    Returns:
-        dict: Status and the updated section content.
-    """
-    return _update_strategy_section(client_id, version_number, "appendix_a", content)
+# Every section in one fixed-shape UPDATE: sections not being edited are passed as NULL
+# and keep their content via COALESCE
+_STRATEGY_BULK_UPDATE_SQL = text(
+    "UPDATE strategies SET "
+    + ", ".join(f"{key} = COALESCE(:{key}, {key})" for key in _STRATEGY_KEYS)
+    + ", updated_at = NOW() WHERE client_id = :client_id AND version_number = :version_number"
+)
 
 
-@mcp.tool
-def editStrategyAppendixB(client_id: int, version_number: int, content: str) -> dict:
-    """
-    Updates Appendix B: Key Contacts of a strategy.
+def _bulk_edit_strategy_sections(client_id: int, version_number: int, sections: dict[str, str]) -> dict:
+    """Update several strategy sections in one transaction (blocking; run via asyncio.to_thread)."""
+    invalid = [key for key in sections if key not in STRATEGY_SECTIONS]
+    if invalid:
+        raise ValueError(f"Invalid section keys: {invalid}. Valid keys: {_VALID_STRATEGY_KEYS_REPR}")
+    if not sections:
+        return {
+            "status": "no_changes",
+            "client_id": client_id,
+            "version_number": version_number,
+            "message": "No sections provided to update"
+        }
     
-    Args:
-        client_id (int): The client ID.
-        version_number (int): The strategy version to edit.
-        content (str): The new content for this section (markdown format).
+    params = dict.fromkeys(_STRATEGY_KEYS)
+    params.update(sections)
+    params["client_id"] = client_id
+    params["version_number"] = version_number
+    with _db_writer() as conn:
+        updated = conn.execute(_STRATEGY_BULK_UPDATE_SQL, params).rowcount
+    if not updated:
+        raise ValueError(f"Strategy not found for client_id={client_id}, version_number={version_number}")
     
-    Returns:
-        dict: Status and the updated section content.
-    """
-    return _update_strategy_section(client_id, version_number, "appendix_b", content)
+    return {
+        "status": "success",
+        "client_id": client_id,
+        "version_number": version_number,
+        "sections_updated": list(sections),
+        "content_lengths": {key: len(content) for key, content in sections.items()}
+    }
 
 
 @mcp.tool
-def editStrategyAppendixC(client_id: int, version_number: int, content: str) -> dict:
+async def bulkEditStrategySections(client_id: int, version_number: int, sections: dict[str, str]) -> dict:
     """
-    Updates Appendix C: Sitemap with recommended Keywords of a strategy.
-    Use get_kw_sitemap(client_id) to obtain the current keyword enhanced sitemap (NDJSON).
-    Use update_kw_sitemap(client_id) to regenerate the sitemap before editing if needed.
+    Updates several sections of a strategy in one write. Use this instead of calling the
+    individual editStrategy* tools one after another.
     
     Args:
         client_id (int): The client ID.
         version_number (int): The strategy version to edit.
-        content (str): The new content for this section (markdown format; typically the sitemap with recommended keywords).
+        sections (dict): Section key -> new content (markdown format). Valid keys are
+            executive_summary, section_1 ... section_14, appendix_a, appendix_b and appendix_c.
     
     Returns:
-        dict: Status and the updated section content.
+        dict: Status, the section keys updated, and each section's content length.
     """
-    return _update_strategy_section(client_id, version_number, "appendix_c", content)
+    return await asyncio.to_thread(_bulk_edit_strategy_sections, client_id, version_number, sections)
 
 
 # --- DataForSEO Keywords Data (Google Ads) ---
 KEYWORDS_DATA_BASE = "https://api.dataforseo.com/v3/keywords_data/google_ads"
 
 
-def _dataforseo_keywords_post(endpoint: str, payload: list) -> dict:
-    """POST to DataForSEO keywords_data/google_ads endpoint. Returns full JSON."""
-    auth = _dataforseo_basic_auth()
-    if not auth:
-        raise ValueError("DATAFORSEO_USERNAME + DATAFORSEO_API_SECRET (or API_KEY) not set.")
+async def _dataforseo_keywords_post(endpoint: str, payload: list, no_cache: bool = False) -> list:
+    """POST to DataForSEO keywords_data/google_ads endpoint. Returns the task's result list."""
     url = f"{KEYWORDS_DATA_BASE}/{endpoint}"
-    headers = {"Content-Type": "application/json", "Authorization": f"Basic {auth}"}
-    r = requests.post(url, headers=headers, json=payload, timeout=120)
-    r.raise_for_status()
-    return r.json()
+    return await _dfs_call(url, payload, no_cache=no_cache, timeout=120)
 
 
 # --- DataForSEO Labs: Keyword Opportunities (competitors + gap keywords) ---
@@ -2601,50 +3121,46 @@ LABS_BASE = "https://api.dataforseo.com/v3/dataforseo_labs/google"
 MAX_OPPORTUNITIES_COMPETITORS = 3
 MAX_OPPORTUNITIES_KEYWORDS_PER_COMPETITOR = 250
 MIN_OPPORTUNITIES_VOLUME = 10
+OPPORTUNITIES_TOP_N = 200
 
 
-def _dataforseo_labs_post(endpoint: str, payload: list) -> dict:
-    auth = _dataforseo_basic_auth()
-    if not auth:
-        raise ValueError("DATAFORSEO_USERNAME + DATAFORSEO_API_SECRET (or API_KEY) not set.")
+async def _dataforseo_labs_post(endpoint: str, payload: list) -> dict:
+    """
+    POST to a DataForSEO Labs endpoint through the shared client and response cache. Repeat
+    competitor/gap lookups for the same domain, location and limits are served from cache.
+    """
     url = f"{LABS_BASE}/{endpoint}"
-    headers = {"Content-Type": "application/json", "Authorization": f"Basic {auth}"}
-    r = requests.post(url, headers=headers, json=payload, timeout=60)
-    r.raise_for_status()
-    return r.json()
+    return await _dfs_post_cached(url, payload, timeout=60)
 
 
-def _fetch_competitors_domain(target: str, location_code: int = 2124, language_code: str = "en", limit: int = 50) -> list[str]:
-    """Fetch organic competitors for target. Returns list of competitor domains (max 50 from API)."""
+async def _fetch_competitors_domain(target: str, location_code: int = 2124, language_code: str = "en", limit: int = 50) -> list[str]:
+    """
+    Fetch organic competitors for target, an already-normalized domain (see _opportunities_target).
+    Returns list of competitor domains (max 50 from API).
+    """
     payload = [{
-        "target": _normalize_target_domain(target) or target,
+        "target": target,
         "location_code": location_code,
         "language_code": language_code,
         "limit": limit,
     }]
-    data = _dataforseo_labs_post("competitors_domain/live", payload)
+    data = await _dataforseo_labs_post("competitors_domain/live", payload)
     domains = []
     for task in data.get("tasks") or []:
         for res in task.get("result") or []:
-            items = res.get("items") or res.get("items_data") or (res.get("items_data") or {}).get("items") or []
+            items_data = res.get("items_data")
+            items = res.get("items") or items_data or (items_data or {}).get("items") or []
             if isinstance(items, list):
                 for it in items:
                     d = it.get("domain") or it.get("competitor")
                     if d and isinstance(d, str):
                         domains.append(d.strip().lower())
-    # Dedupe, exclude target, return list
-    target_norm = (_normalize_target_domain(target) or target).lower()
-    seen = set()
-    out = []
-    for d in domains:
-        if d == target_norm or d in seen:
-            continue
-        seen.add(d)
-        out.append(d)
-    return out
+    # Dedupe (keeping API order), exclude target
+    target_norm = target.lower()
+    return [d for d in dict.fromkeys(domains) if d != target_norm]
 
 
-def _fetch_domain_intersection_gap(
+async def _fetch_domain_intersection_gap(
     competitor_domain: str,
     target_domain: str,
     location_code: int = 2124,
@@ -2664,33 +3180,36 @@ def _fetch_domain_intersection_gap(
         "filters": [["keyword_data.keyword_info.search_volume", ">", min_vol]],
         "order_by": ["keyword_data.keyword_info.search_volume,desc"],
     }]
-    data = _dataforseo_labs_post("domain_intersection/live", payload)
+    data = await _dataforseo_labs_post("domain_intersection/live", payload)
     items = []
     for task in data.get("tasks") or []:
         for res in task.get("result") or []:
-            raw = res.get("items") or res.get("items_data") or (res.get("items_data") or {}).get("items") or []
+            items_data = res.get("items_data")
+            raw = res.get("items") or items_data or (items_data or {}).get("items") or []
             if isinstance(raw, list):
                 items.extend(raw)
     return items
 
 
-def fetch_keyword_opportunities_impl(
+async def fetch_keyword_opportunities_impl(
     domain: str,
     location_code: int = 2124,
     language_code: str = "en",
     max_competitors: int = MAX_OPPORTUNITIES_COMPETITORS,
     gap_limit: int = MAX_OPPORTUNITIES_KEYWORDS_PER_COMPETITOR,
     min_vol: int = MIN_OPPORTUNITIES_VOLUME,
+    top_n: int = OPPORTUNITIES_TOP_N,
 ) -> dict:
     """
     Ahrefs-style keyword opportunities: get organic competitors, then gap keywords (they rank, we don't).
-    Returns { "opportunities": [...], "competitors_used": [...], "error": optional }.
+    Returns { "opportunities": [...], "competitors_used": [...], "error": optional }, with the
+    top_n opportunities by score.
     Each opportunity: keyword, search_volume, cpc, competition, competitor_count, example_competitors, score.
     """
-    target = _normalize_target_domain(domain) or domain.replace("https://", "").replace("http://", "").strip().lower()
+    target = _opportunities_target(domain)
     if not target:
         return {"opportunities": [], "competitors_used": [], "error": "Invalid or missing domain"}
-    if not _dataforseo_basic_auth():
+    if not _DFS_AUTH:
         return {"opportunities": [], "competitors_used": [], "error": "DATAFORSEO credentials not set"}
 
     max_competitors = min(max_competitors, MAX_OPPORTUNITIES_COMPETITORS)
@@ -2698,26 +3217,32 @@ def fetch_keyword_opportunities_impl(
 
     try:
         logger.info("[Keyword Opportunities] Fetching competitors for target=%s location=%s", target, location_code)
-        competitors = _fetch_competitors_domain(target, location_code=location_code, language_code=language_code)
+        competitors = await _fetch_competitors_domain(target, location_code=location_code, language_code=language_code)
         competitors = [c for c in competitors if c != target][:max_competitors]
         if not competitors:
             logger.warning("[Keyword Opportunities] No competitors found for %s", target)
             return {"opportunities": [], "competitors_used": [], "error": None}
 
         logger.info("[Keyword Opportunities] Using competitors: %s", competitors)
-        # Aggregate by keyword: keyword -> { max_vol, max_cpc, max_comp, competitors[] }
-        agg: dict[str, dict] = {}
-        for comp in competitors:
-            try:
-                items = _fetch_domain_intersection_gap(
+        # Fetch every competitor's gap keywords concurrently
+        gaps = await asyncio.gather(
+            *(
+                _fetch_domain_intersection_gap(
                     comp, target,
                     location_code=location_code,
                     language_code=language_code,
                     limit=gap_limit,
                     min_vol=min_vol,
                 )
-            except Exception as e:
-                logger.warning("[Keyword Opportunities] Gap fetch failed for %s: %s", comp, e)
+                for comp in competitors
+            ),
+            return_exceptions=True,
+        )
+        # Aggregate by keyword: keyword -> { max_vol, max_cpc, max_comp, competitors{} }
+        agg: dict[str, dict] = {}
+        for comp, items in zip(competitors, gaps):
+            if isinstance(items, Exception):
+                logger.warning("[Keyword Opportunities] Gap fetch failed for %s: %s", comp, items)
                 continue
             for it in items:
                 kw = (it.get("keyword") or (it.get("keyword_data") or {}).get("keyword") or "").strip()
@@ -2727,28 +3252,38 @@ def fetch_keyword_opportunities_impl(
                 vol = int(ki.get("search_volume") or 0)
                 cpc = float(ki.get("cpc") or 0)
                 comp_val = float(ki.get("competition") or 0)
-                if kw not in agg:
-                    agg[kw] = {"search_volume": vol, "cpc": cpc, "competition": comp_val, "competitors": []}
-                else:
-                    agg[kw]["search_volume"] = max(agg[kw]["search_volume"], vol)
-                    agg[kw]["cpc"] = max(agg[kw]["cpc"], cpc)
-                    agg[kw]["competition"] = max(agg[kw]["competition"], comp_val)
-                if comp not in agg[kw]["competitors"]:
-                    agg[kw]["competitors"].append(comp)
-
+                entry = agg.get(kw)
+                if entry is None:
+                    # competitors is an insertion-ordered dict used as a set: O(1) dedupe
+                    agg[kw] = {"search_volume": vol, "cpc": cpc, "competition": comp_val, "competitors": {comp: None}}
+                    continue
+                if vol > entry["search_volume"]:
+                    entry["search_volume"] = vol
+                if cpc > entry["cpc"]:
+                    entry["cpc"] = cpc
+                if comp_val > entry["competition"]:
+                    entry["competition"] = comp_val
+                entry["competitors"][comp] = None
+
+        # Partial selection on the raw score: O(N log top_n) rather than sorting every aggregated
+        # keyword, and only the winners pay for rounding and building the output dict
+        top = heapq.nlargest(
+            top_n,
+            ((v["search_volume"] * (1 + v["cpc"]), kw, v) for kw, v in agg.items()),
+            key=lambda t: t[0],
+        )
         opportunities = []
-        for kw, v in agg.items():
-            score = v["search_volume"] * (1 + v["cpc"])
+        for score, kw, v in top:
+            competitors_for_kw = list(v["competitors"])
             opportunities.append({
                 "keyword": kw,
                 "search_volume": v["search_volume"],
                 "cpc": round(v["cpc"], 4),
                 "competition": round(v["competition"], 4),
-                "competitor_count": len(v["competitors"]),
-                "example_competitors": ",".join(v["competitors"][:5]),
+                "competitor_count": len(competitors_for_kw),
+                "example_competitors": ",".join(competitors_for_kw[:5]),
                 "score": round(score, 4),
             })
-        opportunities.sort(key=lambda x: x["score"], reverse=True)
         logger.info("[Keyword Opportunities] Returning %d opportunities for %s", len(opportunities), target)
         return {"opportunities": opportunities, "competitors_used": competitors, "error": None}
     except Exception as e:
@@ -2758,12 +3293,11 @@ def fetch_keyword_opportunities_impl(
 
 @mcp.custom_route("/keyword-opportunities", methods=["POST"])
 async def keyword_opportunities_route(request):
-    """POST with JSON { \"domain\": \"setsail.ca\", \"location_code\": 2124 }; returns opportunities JSON."""
-    import asyncio
-    from starlette.responses import JSONResponse
+    """POST with JSON { \"domain\": \"setsail.ca\", \"location_code\": 2124, \"top_n\": 200 }; returns opportunities JSON."""
+    from starlette.responses import JSONResponse, Response
 
     try:
-        body = await request.json()
+        body = orjson.loads(await request.body())
     except Exception as e:
         return JSONResponse({"error": f"Invalid JSON: {e}"}, status_code=400)
     domain = (body.get("domain") or body.get("target") or "").strip()
@@ -2771,25 +3305,36 @@ async def keyword_opportunities_route(request):
         return JSONResponse({"error": "Missing domain or target"}, status_code=400)
     location_code = int(body.get("location_code", 2124))
     language_code = str(body.get("language_code", "en"))
+    top_n = int(body.get("top_n", OPPORTUNITIES_TOP_N))
     try:
-        result = await asyncio.to_thread(
-            fetch_keyword_opportunities_impl,
+        result = await fetch_keyword_opportunities_impl(
             domain,
             location_code=location_code,
             language_code=language_code,
             max_competitors=MAX_OPPORTUNITIES_COMPETITORS,
             gap_limit=MAX_OPPORTUNITIES_KEYWORDS_PER_COMPETITOR,
             min_vol=MIN_OPPORTUNITIES_VOLUME,
+            top_n=top_n,
         )
     except Exception as e:
         logger.exception("[Keyword Opportunities] route failed")
         return JSONResponse({"error": str(e)}, status_code=500)
     if result.get("error") and not result.get("opportunities"):
         return JSONResponse({"error": result["error"]}, status_code=502)
-    return JSONResponse(result)
+    # Hundreds of opportunity dicts with floats: orjson encodes them far faster than stdlib json
+    return Response(orjson.dumps(result), media_type="application/json")
 
 
 if __name__ == "__main__":
-    # Run the MCP server
-    mcp.run(transport="streamable-http", host="0.0.0.0", port=int(os.environ.get("PORT", "8000")))
+    from starlette.middleware import Middleware
+    from starlette.middleware.gzip import GZipMiddleware
+
+    # Run the MCP server; gzip JSON responses (HTML artifacts, strategies, opportunities) over 1 KB.
+    # Starlette leaves text/event-stream uncompressed so streamed events are not buffered.
+    mcp.run(
+        transport="streamable-http",
+        host="0.0.0.0",
+        port=int(os.environ.get("PORT", "8000")),
+        middleware=[Middleware(GZipMiddleware, minimum_size=1024)],
+    )
 